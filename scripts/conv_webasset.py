@@ -10,20 +10,30 @@ import glob
 import argparse
 import logging
 from types import SimpleNamespace
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
 
 from lib.file_processing import read_json_file
 from lib.config_builder import ConfigBuilder
 from converters.converter_factory import get_converter, FileType
-from lib.exports.collada2gltf import convert_dir, convert_file
+from lib.exports.collada2gltf import convert_file, convert_one_file
 
-CONVERT_COLLADA = False
-''' Runs the collada2gltf program after creating COLLADA files
+CONVERT_COLLADA = True
+''' Runs the collada2gltf program after creating COLLADA files, the '-g' flag turns this off
 '''
 
 DEBUG_LVL = logging.INFO
 ''' Initialise debug level to minimal debugging
 '''
 
+NUM_PROCESSES = 1
+''' Number of processes used to convert the files in a directory
+'''
+
+WORKER_CONVERTER = None
+''' Converter object created in each worker process, used when converting files in parallel
+'''
+
 # Set up debugging
 LOGGER = logging.getLogger("conv_webasset")
 
@@ -44,52 +54,208 @@ LOGGER.setLevel(DEBUG_LVL)
 
 
 
-def find(converter_obj, src_dir, dest_dir, config_build_obj):
+def find(converter_obj, src_dir, dest_dir, config_build_obj, executor=None):
     ''' Searches for 3rd party model files in all the subdirectories
 
     :param converter_obj: file converter object
     :param src_dir: directory in which to begin the search
     :param dest_dir: directory to store output
     :param config_build_obj: ConfigBuilder object
+    :param executor: optional 'ProcessPoolExecutor' made by 'make_process_pool',
+                     if supplied then files are converted in parallel
     '''
-    LOGGER.debug(f"find({src_dir}, {dest_dir})")
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        LOGGER.debug(f"find({src_dir}, {dest_dir})")
     found = False
-    walk_obj = os.walk(src_dir)
     supported_exts = converter_obj.get_supported_exts()
-    for root, subfolders, files in walk_obj:
+    ext_set = frozenset(ext_str.upper() for ext_str in supported_exts)
+    # Extensions in the form used by 'find_and_process', made once for all directories
+    dot_ext_list = get_dot_exts(supported_exts)
+    # Walk the directory tree top down, visiting subdirectories in the order they are listed
+    dir_stack = [src_dir]
+    while dir_stack:
+        root = dir_stack.pop()
+        try:
+            with os.scandir(root) as entry_iter:
+                entry_list = list(entry_iter)
+        except OSError as os_exc:
+            LOGGER.warning(f"Cannot search {root}: {os_exc}")
+            continue
+        subdir_list = []
         done = False
-        for file in files:
-            name_str, fileext_str = os.path.splitext(file)
-            for target_fileext_str in supported_exts:
-                if fileext_str.lstrip('.').upper() == target_fileext_str:
-                    find_and_process(converter_obj, root, dest_dir)
-                    found = True
-                    done = True
-                    break
-            if done:
-                break
+        for entry in entry_list:
+            if entry.is_dir(follow_symlinks=False):
+                subdir_list.append(entry.path)
+            elif not done and os.path.splitext(entry.name)[1].lstrip('.').upper() in ext_set \
+                 and not entry.is_dir():
+                done = True
+        if done:
+            find_and_process(converter_obj, root, dest_dir, executor, dot_ext_list)
+            found = True
+        dir_stack.extend(reversed(subdir_list))
     if not found:
         LOGGER.info(f"No files found with extensions: {supported_exts}")
 
 
-def find_and_process(converter_obj, src_dir, dest_dir):
+def get_dot_exts(supported_exts):
+    ''' Converts a list of supported file extensions to lower case extensions with a leading dot
+
+    :param supported_exts: list of file extensions e.g. ['TS', 'VO']
+    :returns: tuple of extensions e.g. ('.ts', '.vo')
+    '''
+    return tuple('.'+ext_str.lower() for ext_str in supported_exts)
+
+
+def find_and_process(converter_obj, src_dir, dest_dir, executor=None, dot_ext_list=None):
     ''' Searches for files in local directory and processes them
 
+    :param converter_obj: file converter object
     :param src_dir: source directory where there are 3rd party model files
     :param dest_dir: destination directory where output is written to
-    :param ext_list: list of supported file extensions
+    :param executor: optional 'ProcessPoolExecutor' made by 'make_process_pool',
+                     if supplied then files are converted in parallel
+    :param dot_ext_list: optional extensions as returned by 'get_dot_exts', if not supplied
+                         then they are fetched from the converter
     '''
-    LOGGER.debug(f"find_and_process({src_dir}, {dest_dir})")
-    for ext_str in converter_obj.get_supported_exts():
-        wildcard_str = os.path.join(src_dir, "*."+ext_str.lower())
-        file_list = glob.glob(wildcard_str)
-        for filename_str in file_list:
-            print("converter_obj",converter_obj, filename_str)		            
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        LOGGER.debug(f"find_and_process({src_dir}, {dest_dir})")
+    # Scan the directory once, sorting files by extension, which is matched in lower case only.
+    # Files are processed in order of extension, as listed by the converter
+    if dot_ext_list is None:
+        dot_ext_list = get_dot_exts(converter_obj.get_supported_exts())
+    file_dict = {dot_ext: [] for dot_ext in dot_ext_list}
+    with os.scandir(src_dir) as entry_iter:
+        for entry in entry_iter:
+            # Like 'glob', skip hidden files
+            if entry.name.startswith('.'):
+                continue
+            file_list = file_dict.get(os.path.splitext(entry.name)[1])
+            if file_list is not None and entry.is_file():
+                file_list.append(entry.path)
+    src_file_list = [filename_str for file_list in file_dict.values() for filename_str in file_list]
+
+    # When files are processed one at a time, the COLLADA files made from each source file are
+    # converted to GLTF v2 in a background thread, overlapping with the processing of the next file
+    gltf_executor = None
+    converted_set = set()
+    if CONVERT_COLLADA:
+        gltf_executor = ThreadPoolExecutor(max_workers=1)
+    dae_wildcard = os.path.join(glob.escape(dest_dir), "*.dae")
+
+    if executor is not None and len(src_file_list) > 1:
+        # Workers write their COLLADA files at the same time, so any of them could be incomplete
+        # until all workers have finished. They are all converted below
+        process_parallel(converter_obj, src_file_list, dest_dir, executor)
+    else:
+        for filename_str in src_file_list:
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug(f"find_and_process: processing {filename_str}")
+            if gltf_executor is not None:
+                prev_dae_set = set(glob.glob(dae_wildcard))
             converter_obj.process(filename_str, dest_dir)
+            if gltf_executor is not None:
+                # Only the files this source file made are converted, other names may match
+                # files that the next source file is about to write
+                daefile_list = sorted(set(glob.glob(dae_wildcard)) - prev_dae_set)
+                converted_set.update(daefile_list)
+                gltf_executor.submit(convert_collada_files, daefile_list)
 
-    # Convert all files from COLLADA to GLTF v2
-    if CONVERT_COLLADA:
-        convert_dir(dest_dir)
+    # Convert the remaining files from COLLADA to GLTF v2
+    if gltf_executor is not None:
+        gltf_executor.shutdown(wait=True)
+        for daefile_str in glob.glob(dae_wildcard):
+            if daefile_str not in converted_set:
+                convert_one_file(daefile_str)
+
+
+def convert_collada_files(daefile_list):
+    ''' Converts a list of COLLADA files to GLTF v2
+
+    :param daefile_list: list of COLLADA filenames, including path
+    '''
+    for daefile_str in daefile_list:
+        convert_one_file(daefile_str)
+
+
+def make_process_pool(converter_class, converter_args):
+    ''' Makes the pool of processes used to convert files in parallel, it is shared by all
+        the directories that are converted. Returns a context that gives None if only one
+        process is used, so that files are converted in this process
+
+    :param converter_class: converter class e.g. 'Gocad2WebAsset'
+    :param converter_args: tuple of arguments passed to the converter's constructor
+    :returns: 'ProcessPoolExecutor' or a 'no_process_pool' context
+    '''
+    if NUM_PROCESSES <= 1:
+        return no_process_pool()
+    return ProcessPoolExecutor(max_workers=NUM_PROCESSES, initializer=init_worker,
+                               initargs=(converter_class, converter_args))
+
+
+@contextmanager
+def no_process_pool():
+    ''' Context used in place of a pool of processes when only one process is used
+
+    :returns: None
+    '''
+    yield None
+
+
+def init_worker(converter_class, converter_args):
+    ''' Creates the converter object used by a worker process
+
+    :param converter_class: converter class e.g. 'Gocad2WebAsset'
+    :param converter_args: tuple of arguments passed to the converter's constructor
+    '''
+    global WORKER_CONVERTER
+    WORKER_CONVERTER = converter_class(*converter_args)
+
+
+def process_in_worker(filename_str, dest_dir):
+    ''' Converts a file within a worker process
+
+    :param filename_str: filename of file to be processed, including path
+    :param dest_dir: destination directory where output is written to
+    :returns: a tuple (list of model config dicts, list of extents) created by the conversion
+    '''
+    # Start with an empty config builder so only this file's output is returned
+    WORKER_CONVERTER.config_build_obj = ConfigBuilder()
+    WORKER_CONVERTER.process(filename_str, dest_dir)
+    return WORKER_CONVERTER.config_build_obj.config_list, WORKER_CONVERTER.config_build_obj.extent_list
+
+
+def process_parallel(converter_obj, src_file_list, dest_dir, executor):
+    ''' Converts a list of files using a pool of processes, then adds the output
+        of each conversion to the converter object's config builder.
+        Files with the same name but different extensions write the same output files,
+        so each one is only converted after the one before it has finished
+
+    :param converter_obj: file converter object
+    :param src_file_list: list of filenames to be processed, including path
+    :param dest_dir: destination directory where output is written to
+    :param executor: 'ProcessPoolExecutor' made by 'make_process_pool'
+    '''
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        LOGGER.debug(f"process_parallel({src_file_list}, {dest_dir})")
+    # Key is output file name without extension, value is future of the last file writing it
+    out_dict = {}
+    future_list = []
+    for filename_str in src_file_list:
+        out_name = os.path.splitext(os.path.basename(filename_str))[0]
+        prev_future = out_dict.get(out_name)
+        if prev_future is not None:
+            LOGGER.warning(f"{filename_str} has the same output files as another file in {dest_dir}, "
+                           "they will be converted one after the other")
+            wait([prev_future])
+        out_dict[out_name] = executor.submit(process_in_worker, filename_str, dest_dir)
+        future_list.append(out_dict[out_name])
+
+    # Results are added in the same order as 'src_file_list'
+    for future in future_list:
+        config_list, extent_list = future.result()
+        converter_obj.config_build_obj.add_config_list(config_list)
+        for extent in extent_list:
+            converter_obj.config_build_obj.add_ext(extent)
 
 
 def check_input_params(param_dict, param_file):
@@ -213,6 +379,10 @@ if __name__ == "__main__":
                         help='Output folder for graphics files')
     PARSER.add_argument('-g', '--no_gltf', action='store_true',
                         help='Create COLLADA files, but do not convert to GLTF')
+    PARSER.add_argument('-p', '--processes', action='store', type=int, nargs='?',
+                        const=os.cpu_count(), default=1,
+                        help='Number of processes used to convert files in a directory, ' \
+                             'if no number is given then uses all CPUs')
     ARGS = PARSER.parse_args()
 
     # If just want to create COLLADA files without converting them to GLTF
@@ -233,6 +403,10 @@ if __name__ == "__main__":
     else:
         DEBUG_LVL = logging.INFO
 
+    # Set number of processes used to convert directories of files
+    if ARGS.processes > 1:
+        NUM_PROCESSES = ARGS.processes
+
     # Read parameters & initialise converter
     params_obj, model_url_path, coord_offset, ct_file_dict = initialise_params(ARGS.param_file)
 
@@ -240,19 +414,21 @@ if __name__ == "__main__":
     for file_type in (FileType.GOCAD, FileType.XYZV):
         ConverterClass = get_converter(file_type)
         print(ConverterClass)
-        converter = ConverterClass(DEBUG_LVL, params_obj, model_url_path, coord_offset, ct_file_dict, ARGS.nondefault_coords)
+        converter_args = (DEBUG_LVL, params_obj, model_url_path, coord_offset, ct_file_dict, ARGS.nondefault_coords)
+        converter = ConverterClass(*converter_args)
         print(converter)
 
-        # Process a directory of files
+        # Process a directory of files, one pool of processes is used for all directories
         if os.path.isdir(ARGS.src):
+            with make_process_pool(ConverterClass, converter_args) as executor:
 
-            # Recursively search subdirectories
-            if ARGS.recursive:
-                find(converter, ARGS.src, DEST_DIR, converter.config_build_obj)
+                # Recursively search subdirectories
+                if ARGS.recursive:
+                    find(converter, ARGS.src, DEST_DIR, converter.config_build_obj, executor)
 
-            # Only search local directory
-            else:
-                find_and_process(converter, ARGS.src, DEST_DIR)
+                # Only search local directory
+                else:
+                    find_and_process(converter, ARGS.src, DEST_DIR, executor)
 
         # Process a single file
         elif os.path.isfile(ARGS.src):
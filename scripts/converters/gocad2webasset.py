@@ -417,8 +417,8 @@ class Gocad2WebAsset(Converter):
 
         # Open GOCAD file and read all its contents, assume it fits in memory
         try:
-            file_d = open(filename, 'r')
-            whole_file_lines = file_d.readlines()
+            with open(filename, 'r') as file_d:
+                whole_file_lines = file_d.readlines()
         except OSError as os_exc:
             self.logger.error(f"Can't open or read - skipping file {filename}, {os_exc}")
             return False
@@ -441,7 +441,6 @@ class Gocad2WebAsset(Converter):
         elif self.file_datastr_map.is_mixture(filename):
             ok = self.process_groups(whole_file_lines, dest_dir, noext_filename, base_xyz, filename, src_dir, out_filename)
 
-        file_d.close()
         if ok:
             self.logger.debug("process() returns True")
             return True
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from pyproj import Transformer
 
 def __clean_crs(crs):
@@ -11,14 +13,31 @@ def __clean_crs(crs):
     return pair[0]+':'+pair[1]
 
 
+@lru_cache(maxsize=32)
+def __get_transformer(input_crs, output_crs):
+    ''' Creates a 'Transformer' object, these are cached as they are slow to create
+
+    :param input_crs: coordinate reference system of input coordinates, without namespace prefix
+    :param output_crs: coordinate reference system of output coordinates, without namespace prefix
+    :returns: pyproj 'Transformer' object
+    '''
+    return Transformer.from_crs(input_crs, output_crs, always_xy=True)
+
+
 def convert_coords(input_crs, output_crs, x_y):
     ''' Converts coordinate systems
 
     :param input_crs: coordinate reference system of input coordinates
     :param output_crs: coordinate reference system of output coordinates
-    :param x_y: input coordinates in [x,y] format
+    :param x_y: input coordinates in [x,y] format, x and y can also be sequences or numpy arrays \
+                of coordinates, which are converted in one call
     :returns: converted coordinates [x,y], [math.inf, math.inf] upon error
     '''
-    transformer = Transformer.from_crs(__clean_crs(input_crs), __clean_crs(output_crs), always_xy=True)
+    input_crs = __clean_crs(input_crs)
+    output_crs = __clean_crs(output_crs)
+    # No need to convert if both coordinate systems are the same
+    if input_crs.upper() == output_crs.upper():
+        return x_y[0], x_y[1]
+    transformer = __get_transformer(input_crs, output_crs)
     return transformer.transform(x_y[0], x_y[1])
 
@@ -2,7 +2,7 @@
 """
 Uses 'sqlalchemy' library to create a simple 'sqlite' db to hold query results for models
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy import Column, Integer, String, Boolean
 from sqlalchemy.orm import sessionmaker, relationship, scoped_session
@@ -41,7 +41,9 @@ class Query(Base):
     model_info = relationship('ModelInfo')
     user_info = relationship('UserInfo')
 
-    __table_args__ = (PrimaryKeyConstraint('model_name', 'label', name='_query_uc'),)
+    # Rows are looked up by their composite primary key, so there is no need for a 'rowid'
+    __table_args__ = (PrimaryKeyConstraint('model_name', 'label', name='_query_uc'),
+                      {'sqlite_with_rowid': False})
 
     def __repr__(self):
         result = "Query:" + \
@@ -132,15 +134,26 @@ class QueryDB():
     ''' A simple database class to manage the creation, writing and reading of the query database
 
     '''
-    def __init__(self, create=False, db_name='query_data.db'):
+    def __init__(self, create=False, db_name='query_data.db', writer=False):
+        ''' Opens or creates the database
+
+        :param create: optional, if True then a new database is created
+        :param db_name: optional, filename of database
+        :param writer: optional, if True then the connections are tuned for bulk writing, \
+                       and 'close()' must be called once writing is finished
+        '''
         self.error = ''
+        self.writer = writer
         try:
             db_name = 'sqlite:///' + db_name
             eng = create_engine(db_name, echo=False)
-            Base.metadata.bind = eng
+            self.eng = eng
+            if writer:
+                event.listen(eng, 'connect', self.__set_writer_pragmas)
             if create:
-                Base.metadata.drop_all()
-                Base.metadata.create_all()
+                # Bind explicitly, so that opening another database does not rebind this one
+                Base.metadata.drop_all(bind=eng)
+                Base.metadata.create_all(bind=eng)
             # 'scoped_session()' makes a thread-safe cache of session objects
             #  NOTE: Would like to eventually make scope_session() more global
             self.session_obj = scoped_session(sessionmaker(eng))
@@ -148,17 +161,56 @@ class QueryDB():
         except DatabaseError as db_exc:
             self.error = str(db_exc)
 
+    @staticmethod
+    def __set_writer_pragmas(dbapi_conn, conn_record):
+        """
+        Called for each new 'sqlite' connection of a writer, makes commits and bulk inserts cheaper.
+        Readers are left in the default journal mode, as WAL mode needs writable '-wal' and
+        '-shm' files alongside the database
+
+        :param dbapi_conn: DBAPI connection object
+        :param conn_record: connection pool record (unused)
+        """
+        # pylint: disable=W0613
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        # 64 MiB page cache
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.close()
+
+    def close(self):
+        """
+        Releases the database connections. A writer's database is returned to the default
+        journal mode, so that it is a single self-contained file
+
+        :returns: a tuple (True, None) if successful
+                          (False, exception string) if operation failed
+        """
+        try:
+            if hasattr(self, 'session_obj'):
+                if self.writer:
+                    self.ses.execute(text("PRAGMA journal_mode=DELETE"))
+                self.session_obj.remove()
+            if hasattr(self, 'eng'):
+                self.eng.dispose()
+        except DatabaseError as db_exc:
+            return False, str(db_exc)
+        return True, None
+
     def get_error(self):
         """
         :returns: the current error message
         """
         return self.error
 
-    def add_segment(self, json_str):
+    def add_segment(self, json_str, commit=True):
         """
         Adds a segment object to database
 
         :param json_str: segment object as a JSON string
+        :param commit: optional, if False then the caller must call 'commit()' later
         :returns: a tuple (True, seginfo_obj) if successful
                           (False, exception string) if operation failed
         """
@@ -167,16 +219,18 @@ class QueryDB():
             if seginfo_obj is None:
                 seginfo_obj = SegmentInfo(json=json_str)
                 self.ses.add(seginfo_obj)
-                self.ses.commit()
+                if commit:
+                    self.ses.commit()
         except DatabaseError as db_exc:
             return False, str(db_exc)
         return True, seginfo_obj
 
-    def add_part(self, json_str):
+    def add_part(self, json_str, commit=True):
         """
         Adds a part object to database
 
         :param json_str: part object as a JSON string
+        :param commit: optional, if False then the caller must call 'commit()' later
         :returns: a tuple (True, partinfo_obj) if successful
                           (False, exception string) if operation failed
         """
@@ -185,16 +239,18 @@ class QueryDB():
             if part_obj is None:
                 part_obj = PartInfo(json=json_str)
                 self.ses.add(part_obj)
-                self.ses.commit()
+                if commit:
+                    self.ses.commit()
         except DatabaseError as db_exc:
             return False, str(db_exc)
         return True, part_obj
 
-    def add_model(self, json_str):
+    def add_model(self, json_str, commit=True):
         """
         Adds a model object to database
 
         :param json_str: model object as a JSON string
+        :param commit: optional, if False then the caller must call 'commit()' later
         :returns: a tuple (True, model_obj) if successful
                           (False, exception string) if operation failed
         """
@@ -203,16 +259,18 @@ class QueryDB():
             if model_obj is None:
                 model_obj = ModelInfo(json=json_str)
                 self.ses.add(model_obj)
-                self.ses.commit()
+                if commit:
+                    self.ses.commit()
         except DatabaseError as db_exc:
             return False, str(db_exc)
         return True, model_obj
 
-    def add_user(self, json_str):
+    def add_user(self, json_str, commit=True):
         """
         Adds a user info object to database
 
         :param json_str: user info object as a JSON string
+        :param commit: optional, if False then the caller must call 'commit()' later
         :returns: a tuple (True, userinfo_obj) if successful
                           (False, exception string) if operation failed
         """
@@ -221,16 +279,18 @@ class QueryDB():
             if userinfo_obj is None:
                 userinfo_obj = UserInfo(json=json_str)
                 self.ses.add(userinfo_obj)
-                self.ses.commit()
+                if commit:
+                    self.ses.commit()
         except DatabaseError as db_exc:
             return False, str(db_exc)
         return True, userinfo_obj
 
-    def add_query(self, label, model_name, segment, part, model, user):
+    def add_query(self, label, model_name, segment, part, model, user, commit=True):
         """
         Adds a query object to database
 
         :param json_str: query object as a JSON string
+        :param commit: optional, if False then the caller must call 'commit()' later
         :returns: a tuple (True, query_obj) if successful
                           (False, exception string) if operation failed
         """
@@ -238,11 +298,78 @@ class QueryDB():
             query_obj = Query(label=label, model_name=model_name, segment_info=segment,
                               part_info=part, model_info=model, user_info=user)
             self.ses.merge(query_obj)
+            if commit:
+                self.ses.commit()
+        except DatabaseError as db_exc:
+            return False, str(db_exc)
+        return True, None
+
+    def commit(self):
+        """
+        Commits all the objects added with 'commit=False' in one transaction
+
+        :returns: a tuple (True, None) if successful
+                          (False, exception string) if operation failed
+        """
+        try:
             self.ses.commit()
         except DatabaseError as db_exc:
+            self.ses.rollback()
             return False, str(db_exc)
         return True, None
 
+    def merge(self, db_name):
+        """
+        Copies all the query objects, and the info objects they point to, from another database.
+        Info objects are not duplicated and existing query objects are overwritten
+
+        :param db_name: filename of database to copy from
+        :returns: a tuple (True, None) if successful
+                          (False, exception string) if operation failed
+        """
+        src_qdb = QueryDB(db_name=db_name)
+        try:
+            if src_qdb.get_error() != '':
+                return False, src_qdb.get_error()
+            return self.__merge_from(src_qdb)
+        finally:
+            # Release the source database's connections, so it can be deleted
+            src_qdb.close()
+
+    def __merge_from(self, src_qdb):
+        """
+        Copies all the query objects, and the info objects they point to, from another database.
+        If it fails then nothing is copied, as the target session is rolled back
+
+        :param src_qdb: opened 'QueryDB' object to copy from
+        :returns: a tuple (True, None) if successful
+                          (False, exception string) if operation failed
+        """
+        try:
+            for query_obj in src_qdb.ses.query(Query):
+                info_list = []
+                for info_obj, add_func in ((query_obj.segment_info, self.add_segment),
+                                           (query_obj.part_info, self.add_part),
+                                           (query_obj.model_info, self.add_model),
+                                           (query_obj.user_info, self.add_user)):
+                    if info_obj is None:
+                        info_list.append(None)
+                        continue
+                    is_ok, new_obj = add_func(info_obj.json, commit=False)
+                    if not is_ok:
+                        self.ses.rollback()
+                        return False, new_obj
+                    info_list.append(new_obj)
+                is_ok, err_str = self.add_query(query_obj.label, query_obj.model_name,
+                                                *info_list, commit=False)
+                if not is_ok:
+                    self.ses.rollback()
+                    return False, err_str
+        except DatabaseError as db_exc:
+            self.ses.rollback()
+            return False, str(db_exc)
+        return self.commit()
+
     def query(self, label, model_name):
         """
         Use this to query the database
@@ -6,13 +6,47 @@ import sys
 import logging
 import ctypes
 from ctypes import POINTER, pointer, c_byte
+import numpy
 from pyassimp import structs, export, export_blob, material
 
-from lib.exports.geometry_gen import colour_borehole_gen, tri_gen
+from lib.exports.geometry_gen import batch_borehole_gen, tri_gen
 from lib.exports.export_kit import ExportKit
 
 # import lib.exports.print_assimp as pa
 
+FACE_DTYPE = numpy.dtype({'names': ['mNumIndices', 'mIndices'],
+                          'formats': [numpy.uint32, numpy.uintp],
+                          'offsets': [structs.Face.mNumIndices.offset, structs.Face.mIndices.offset],
+                          'itemsize': ctypes.sizeof(structs.Face)})
+''' numpy equivalent of assimp's 'Face' struct, pointers are stored as integer addresses
+'''
+
+MESH_P = POINTER(structs.Mesh)
+MATERIAL_P = POINTER(structs.Material)
+MAT_PROP_P = POINTER(structs.MaterialProperty)
+NODE_P = POINTER(structs.Node)
+VECTOR3D_P = POINTER(structs.Vector3D)
+UINT_P = POINTER(ctypes.c_uint)
+CHAR_P = POINTER(ctypes.c_char)
+RGBA_ARR = ctypes.c_float * 4
+''' ctypes pointer and array types, made once instead of being looked up on each use
+'''
+
+IDENTITY_MATRIX = structs.Matrix4x4(1.0, 0.0, 0.0, 0.0,
+                                    0.0, 1.0, 0.0, 0.0,
+                                    0.0, 0.0, 1.0, 0.0,
+                                    0.0, 0.0, 0.0, 1.0)
+''' Identity transformation matrix given to every node, it is copied and must not be modified
+'''
+
+POOL_MAX_PER_SIZE = 4
+''' Maximum number of ctypes arrays of the same type and size kept in the pool
+'''
+
+POOL_MAX_BYTES = 64 * 1024 * 1024
+''' Maximum total size in bytes of the ctypes arrays kept in the pool
+'''
+
 
 class AssimpKit(ExportKit):
     ''' Class used to export geometries to assimp lib
@@ -38,10 +72,26 @@ class AssimpKit(ExportKit):
         ''' Assimp scene object
         '''
 
+        self._pool = {}
+        ''' Pool of ctypes arrays that can be reused for the next scene, \
+            key is (ctypes type, array size), value is list of arrays
+        '''
+
+        self._in_use = []
+        ''' ctypes arrays taken from the pool for the current scene
+        '''
+
+        self._pool_bytes = 0
+        ''' Total size in bytes of the ctypes arrays in the pool
+        '''
+
 
     def start_scene(self):
-        ''' Initiate scene creation, only one scene can be created at a time
+        ''' Initiate scene creation, only one scene can be created at a time.
+            If the previous scene was not finished, e.g. an exception was raised while building it,
+            then it is discarded and its arrays are returned to the pool
         '''
+        self.release_scene()
         self.scn = structs.Scene()
         self.scn.mMetadata = None
         self.scn.mPrivate = 0
@@ -58,9 +108,9 @@ class AssimpKit(ExportKit):
         if geom_obj.is_trgl():
 
             # Set up a mesh
-            mesh_p_arr = (POINTER(structs.Mesh) * 1)()
-            mesh_arr_pp = ctypes.cast(mesh_p_arr, POINTER(POINTER(structs.Mesh)))
-            self.scn.mMeshes = mesh_arr_pp
+            mesh_p_arr = self._acquire(MESH_P, 1)
+            # ctypes arrays can be assigned directly to pointer fields of the same type
+            self.scn.mMeshes = mesh_p_arr
             self.scn.mNumMeshes = 1
 
 
@@ -70,9 +120,8 @@ class AssimpKit(ExportKit):
 
 
             # Set up materials
-            mat_p_arr = (POINTER(structs.Material) * 1)()
-            mat_arr_pp = ctypes.cast(mat_p_arr, POINTER(POINTER(structs.Material)))
-            self.scn.mMaterials = mat_arr_pp
+            mat_p_arr = self._acquire(MATERIAL_P, 1)
+            self.scn.mMaterials = mat_p_arr
             self.scn.mNumMaterials = 1
 
             mesh_gen = tri_gen(geom_obj.trgl_arr, geom_obj.vrtx_arr, meta_obj.name)
@@ -106,20 +155,58 @@ class AssimpKit(ExportKit):
                 export(self.scn, out_filename + self.FILE_EXT, self.EXPORT_TYPE)
             except OSError as os_exc:
                 self.logger.error("ERROR - Cannot write file %s: %s", out_filename + self.FILE_EXT, repr(os_exc))
+                self.release_scene()
                 return False
 
             self.logger.info(" DONE.")
             sys.stdout.flush()
+            self.release_scene()
             return True
 
         # Return a blob
         exp_blob = export_blob(self.scn, self.EXPORT_TYPE, processing=None)
         #pa.print_blob(exp_blob)
+        self.release_scene()
         return exp_blob
 
 
+    def release_scene(self):
+        ''' Returns the current scene's ctypes arrays to the pool, for use in the next scene.
+            The scene is discarded, as it refers to these arrays.
+            Arrays that would exceed 'POOL_MAX_PER_SIZE' or 'POOL_MAX_BYTES' are freed instead
+        '''
+        for arr in self._in_use:
+            pool = self._pool[(arr._type_, len(arr))]
+            arr_bytes = ctypes.sizeof(arr)
+            if len(pool) < POOL_MAX_PER_SIZE and self._pool_bytes + arr_bytes <= POOL_MAX_BYTES:
+                pool.append(arr)
+                self._pool_bytes += arr_bytes
+        self._in_use = []
+        self.scn = None
+
+
+    def _acquire(self, c_type, num):
+        ''' Fetches a zeroed ctypes array from the pool, or makes a new one if there are none. \
+            Array sizes are rounded up to the next power of two, so they can be reused more often
+
+        :param c_type: ctypes type of array elements
+        :param num: minimum number of array elements
+        :returns: ctypes array
+        '''
+        size = 1 << max(num - 1, 0).bit_length()
+        pool = self._pool.setdefault((c_type, size), [])
+        if pool:
+            arr = pool.pop()
+            self._pool_bytes -= ctypes.sizeof(arr)
+            ctypes.memset(arr, 0, ctypes.sizeof(arr))
+        else:
+            arr = (c_type * size)()
+        self._in_use.append(arr)
+        return arr
+
+
     def write_borehole(self, base_vrtx, borehole_name, colour_info_dict, height_reso,
-                       out_filename=''):
+                       out_filename='', mesh_list=None):
         ''' Write out a file or blob of a borehole stick
             if 'out_filename' is supplied then writes a file and returns True/False
             else returns a pointer to a 'structs.ExportDataBlob' object
@@ -131,53 +218,93 @@ class AssimpKit(ExportKit):
         :param height_reso: height resolution for colour info dict
         :param out_filename: optional destination directory+file (without extension), \
                              where file is written
+        :param mesh_list: optional list of the tuples yielded by 'batch_borehole_gen()' for \
+                          this borehole, if the caller has already made them
         '''
-        self.logger.debug("write_borehole(%s, %s, %s, colour_info_dict = %s)",
-                          repr(base_vrtx), repr(out_filename), repr(borehole_name),
-                          repr(colour_info_dict))
+        # 'colour_info_dict' can be large, so only make its repr when debugging
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("write_borehole(%s, %s, %s, colour_info_dict = %s)",
+                              repr(base_vrtx), repr(out_filename), repr(borehole_name),
+                              repr(colour_info_dict))
 
         self.start_scene()
 
-        bh_size = len(colour_info_dict)
-
-        # Set up meshes
-        mesh_p_arr = (POINTER(structs.Mesh) * bh_size)()
-        mesh_arr_pp = ctypes.cast(mesh_p_arr, POINTER(POINTER(structs.Mesh)))
-        self.scn.mMeshes = mesh_arr_pp
-        self.scn.mNumMeshes = bh_size
-        gen = colour_borehole_gen(base_vrtx, borehole_name, colour_info_dict, height_reso)
-        # Test to see if there is only one mesh
-        # pylint: disable=W0612
-        *first, mesh_name = next(gen)
-        one_only = False
-        try:
-            next(gen)
-        except StopIteration:
-            one_only = True
+        # Meshes with identical colours share a material, key is RGBA tuple, value is material index
+        mat_dict = {}
+        node_name, mesh_obj_list = self.make_borehole_meshes(base_vrtx, borehole_name,
+                                                             colour_info_dict, height_reso,
+                                                             mat_dict, mesh_list)
+        self.add_meshes(mesh_obj_list)
 
         # Put the mesh name in the mesh's parents, because GLTFLoader
         # copies this into the mesh name
-        self.make_nodes(b'root_node', mesh_name+b'_0', bh_size)
+        self.make_nodes(b'root_node', node_name, len(mesh_obj_list))
+
+        self.add_materials(mat_dict)
+
+        return self.end_scene(out_filename)
+
 
-        # Set up materials
-        mat_p_arr = (POINTER(structs.Material) * bh_size)()
-        mat_arr_pp = ctypes.cast(mat_p_arr, POINTER(POINTER(structs.Material)))
-        self.scn.mMaterials = mat_arr_pp
-        self.scn.mNumMaterials = bh_size
+    def make_borehole_meshes(self, base_vrtx, borehole_name, colour_info_dict, height_reso,
+                             mat_dict, mesh_list=None):
+        ''' Makes the meshes of a borehole stick, segments of the same colour share a mesh
 
-        cb_gen = colour_borehole_gen(base_vrtx, borehole_name, colour_info_dict, height_reso)
-        for vert_list, indices, colour_idx, depth, rgba_colour, class_dict, mesh_name in cb_gen:
+        :param base_vrtx: base vertex, position of the object within the model [x,y,z]
+        :param borehole_name: name of borehole
+        :param colour_info_dict: see 'write_borehole'
+        :param height_reso: height resolution for colour info dict
+        :param mat_dict: dict of materials used by meshes, key is RGBA tuple, \
+                         value is material index. New colours are added to it
+        :param mesh_list: optional, see 'write_borehole'
+        :returns: (name of the meshes' parent node, list of pyassimp 'Mesh' objects)
+        '''
+        if mesh_list is None:
+            mesh_list = list(batch_borehole_gen(base_vrtx, borehole_name, colour_info_dict,
+                                                height_reso))
+        one_only = len(mesh_list) == 1
+        # pylint: disable=W0612
+        *first, mesh_name = mesh_list[0]
+        node_name = mesh_name+b'_0'
+
+        mesh_obj_list = []
+        for vert_list, indices, colour_idx, depth, rgba_colour, class_dict, mesh_name in mesh_list:
             # If there is only one mesh, then GLTFLoader does not append a '_0' to the name,
             # so we must do so, to be consistent with the database
             if one_only:
                 mesh_name += b'_0'
-            mesh_obj = self.make_a_mesh(mesh_name, indices, colour_idx)
-            mesh_p_arr[colour_idx] = ctypes.pointer(mesh_obj)
+            mat_idx = mat_dict.setdefault(tuple(rgba_colour), len(mat_dict))
+            mesh_obj = self.make_a_mesh(mesh_name, indices, mat_idx)
             self.add_vertices_to_mesh(mesh_obj, vert_list)
-            mat_obj = self.make_material(rgba_colour)
-            mat_p_arr[colour_idx] = ctypes.pointer(mat_obj)
+            mesh_obj_list.append(mesh_obj)
+        return node_name, mesh_obj_list
 
-        return self.end_scene(out_filename)
+
+    def add_meshes(self, mesh_obj_list):
+        ''' Sets the scene's meshes
+
+        :param mesh_obj_list: list of pyassimp 'Mesh' objects
+        '''
+        num_meshes = len(mesh_obj_list)
+        mesh_p_arr = self._acquire(MESH_P, num_meshes)
+        # ctypes arrays can be assigned directly to pointer fields of the same type
+        self.scn.mMeshes = mesh_p_arr
+        self.scn.mNumMeshes = num_meshes
+        for mesh_idx, mesh_obj in enumerate(mesh_obj_list):
+            mesh_p_arr[mesh_idx] = ctypes.pointer(mesh_obj)
+
+
+    def add_materials(self, mat_dict):
+        ''' Sets the scene's materials, one for each colour
+
+        :param mat_dict: dict of materials, key is RGBA tuple, value is material index
+        '''
+        num_mats = len(mat_dict)
+        mat_p_arr = self._acquire(MATERIAL_P, num_mats)
+        self.scn.mMaterials = mat_p_arr
+        self.scn.mNumMaterials = num_mats
+        for rgba_colour, mat_idx in mat_dict.items():
+            mat_obj = self.make_material(rgba_colour)
+            mat_p_arr[mat_idx] = ctypes.pointer(mat_obj)
 
 
     def make_empty_node(self, node_name):
@@ -189,10 +316,8 @@ class AssimpKit(ExportKit):
         node = structs.Node()
         node.mName.data = node_name
         node.mName.length = len(node_name)
-        node.mTransformation = structs.Matrix4x4(1.0, 0.0, 0.0, 0.0,
-                                                 0.0, 1.0, 0.0, 0.0,
-                                                 0.0, 0.0, 1.0, 0.0,
-                                                 0.0, 0.0, 0.0, 1.0)
+        # Assigning a struct to a struct field copies its bytes
+        node.mTransformation = IDENTITY_MATRIX
         node.mParent = None
         node.mNumChildren = 0
         node.mChildren = None
@@ -207,25 +332,37 @@ class AssimpKit(ExportKit):
 
         :param root_node_name: bytes object, name of root node
         :param child_node_name: bytes object, name of child of root node
+        :param num_meshes: number of meshes, all are attached to the child node
+        '''
+        self.make_node_tree(root_node_name, [(child_node_name, 0, num_meshes)])
+
+
+    def make_node_tree(self, root_node_name, child_list):
+        ''' Make the scene's root node and its child nodes, each child node has a range of meshes
+
+        :param root_node_name: bytes object, name of root node
+        :param child_list: list of (child node name, index of first mesh, number of meshes) tuples, \
+                           node names are bytes objects
         '''
         # Make a root node
         parent_n = self.make_empty_node(root_node_name)
-        parent_n.mNumChildren = 1
-
-        # Make a child node
-        child_n = self.make_empty_node(child_node_name)
-        child_n.mParent = ctypes.pointer(parent_n)
-
-        # Integer index to meshes
-        mesh_idx_arr = (ctypes.c_uint * num_meshes)()
-        for i in range(num_meshes):
-            mesh_idx_arr[i] = i
-        child_n.mMeshes = ctypes.cast(ctypes.pointer(mesh_idx_arr), POINTER(ctypes.c_uint))
-        child_n.mNumMeshes = num_meshes
-
-        ch_n_p = ctypes.pointer(child_n)
-        ch_n_pp = ctypes.pointer(ch_n_p)
-        parent_n.mChildren = ch_n_pp
+        num_children = len(child_list)
+        parent_n.mNumChildren = num_children
+        ch_n_p_arr = (NODE_P * num_children)()
+
+        for child_idx, (child_node_name, first_mesh, num_meshes) in enumerate(child_list):
+            # Make a child node
+            child_n = self.make_empty_node(child_node_name)
+            child_n.mParent = ctypes.pointer(parent_n)
+
+            # Integer index to meshes, the node must keep the array alive
+            mesh_idx_arr = numpy.arange(first_mesh, first_mesh + num_meshes, dtype=numpy.uintc)
+            child_n.mesh_idx_arr = mesh_idx_arr
+            child_n.mMeshes = mesh_idx_arr.ctypes.data_as(UINT_P)
+            child_n.mNumMeshes = num_meshes
+            ch_n_p_arr[child_idx] = ctypes.pointer(child_n)
+
+        parent_n.mChildren = ch_n_p_arr
         self.scn.mRootNode = ctypes.pointer(parent_n)
 
 
@@ -233,29 +370,31 @@ class AssimpKit(ExportKit):
         ''' Creates a mesh object
 
         :param mesh_name: name of mesh object, bytes object
-        :param index_list: list of integers, indexes into a vertex list
+        :param index_list: list or uint32 numpy array of integers, indexes into a vertex list
         :param material_index: index into scene's array of materials
         :returns: pyassimp 'Mesh' object
         '''
         msh = structs.Mesh()
         num_faces = len(index_list)//3
 
-        f_arr = (structs.Face * num_faces)()
-        msh.mFaces = ctypes.cast(f_arr, POINTER(structs.Face))
+        f_arr = self._acquire(structs.Face, num_faces)
+        msh.mFaces = f_arr
         msh.mNumFaces = num_faces
         msh.mPrimitiveTypes = 4  # Triangle
         msh.mName.length = len(mesh_name)
         msh.mName.data = mesh_name
         msh.mMaterialIndex = material_index
 
-        for f_idx, i_idx  in enumerate(range(0, len(index_list), 3)):
-            i_arr = (ctypes.c_uint * 3)()
-            i_arr[0] = index_list[i_idx]
-            i_arr[1] = index_list[1+i_idx]
-            i_arr[2] = index_list[2+i_idx]
-            i_arr_p = ctypes.cast(i_arr, POINTER(ctypes.c_uint))
-            f_arr[f_idx].mIndices = i_arr_p
-            f_arr[f_idx].mNumIndices = 3
+        # Point each face at its three indices within the index array,
+        # no copy is made if it is already a contiguous uint32 array
+        idx_arr = numpy.ascontiguousarray(index_list, dtype=numpy.uint32)
+        # Faces only hold raw addresses, so the mesh must keep the array alive
+        msh.idx_arr = idx_arr
+        # Fill in all the faces at once, via a numpy view of the 'Face' array
+        face_view = numpy.frombuffer(f_arr, dtype=FACE_DTYPE, count=num_faces)
+        face_view['mNumIndices'] = 3
+        face_view['mIndices'] = numpy.arange(num_faces, dtype=numpy.uintp) * (3 * idx_arr.itemsize) \
+                                + idx_arr.ctypes.data
         return msh
 
 
@@ -263,16 +402,14 @@ class AssimpKit(ExportKit):
         ''' Adds the vertices to a mesh
 
         :param mesh: pyassimp 'Mesh' object
-        :param vertex_list: list of floats, (x,y,z) coords of vertices
+        :param vertex_list: list of floats or float32 numpy array, (x,y,z) coords of vertices
         '''
-        num_vertices = len(vertex_list)//3
-        v_arr = (structs.Vector3D * num_vertices)()
-        v_arr_p = ctypes.cast(v_arr, POINTER(structs.Vector3D))
-        mesh.mVertices = v_arr_p
-        mesh.mNumVertices = num_vertices
-        for varr_idx, v_idx in enumerate(range(0, len(vertex_list), 3)):
-            v_arr[varr_idx] = structs.Vector3D(vertex_list[v_idx], vertex_list[v_idx+1],
-                                               vertex_list[v_idx+2])
+        # 'Vector3D' is three contiguous floats, so a contiguous float32 array
+        # can be handed over as is, without copying
+        vert_arr = numpy.ascontiguousarray(vertex_list, dtype=numpy.float32).reshape(-1, 3)
+        mesh.vert_arr = vert_arr
+        mesh.mVertices = vert_arr.ctypes.data_as(VECTOR3D_P)
+        mesh.mNumVertices = vert_arr.shape[0]
 
 
     def make_colour(self, key, r_val, g_val, b_val, a_val):
@@ -286,9 +423,8 @@ class AssimpKit(ExportKit):
         mat_prop.mIndex = 0
         mat_prop.mType = 1
         mat_prop.mDataLength = 16
-        rgba_type = (ctypes.c_float * 4)
-        col = rgba_type(r_val, g_val, b_val, a_val)
-        mat_prop.mData = ctypes.cast(col, POINTER(ctypes.c_char))
+        col = RGBA_ARR(r_val, g_val, b_val, a_val)
+        mat_prop.mData = ctypes.cast(col, CHAR_P)
         mat_prop.mKey = structs.String(len(key), key) # b'$clr.diffuse'
         return mat_prop
 
@@ -306,7 +442,7 @@ class AssimpKit(ExportKit):
         mat_prop.mType = 5 # 5 = buffer
         mat_prop.mDataLength = 1 # booleans are 1 byte long
         ts_p = pointer(c_byte(1))
-        mat_prop.mData = ctypes.cast(ts_p, POINTER(ctypes.c_char))
+        mat_prop.mData = ctypes.cast(ts_p, CHAR_P)
         mat_prop.mKey = structs.String(len(key), key)
         return mat_prop
 
@@ -329,7 +465,7 @@ class AssimpKit(ExportKit):
             mat.mNumAllocated += 1
             two_s_p = self.make_two_sided()
             two_s_pp = ctypes.pointer(two_s_p)
-            mat_prop_ppp = (POINTER(structs.MaterialProperty) * 2)()
+            mat_prop_ppp = (MAT_PROP_P * 2)()
             mat_prop_ppp[1] = col_pp
             mat_prop_ppp[0] = two_s_pp
         else:
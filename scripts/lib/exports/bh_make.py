@@ -45,7 +45,9 @@ def get_blob_boreholes(borehole_dict, param_obj):
 
     reader = NVCLReader(param_obj)
     if all(key in borehole_dict for key in ['name', 'x', 'y', 'z', 'nvcl_id']):
-        bh_data_dict, base_xyz = get_nvcl_data(reader, param_obj, height_res, borehole_dict['x'], borehole_dict['y'], borehole_dict['z'], borehole_dict['nvcl_id'])
+        x_m, y_m = convert_coords(param_obj.BOREHOLE_CRS, param_obj.MODEL_CRS,
+                                  [borehole_dict['x'], borehole_dict['y']])
+        bh_data_dict, base_xyz = get_nvcl_data(reader, height_res, x_m, y_m, borehole_dict['z'], borehole_dict['nvcl_id'])
 
         # If there's data, then create the borehole
         if bh_data_dict != {}:
@@ -60,21 +62,19 @@ def get_blob_boreholes(borehole_dict, param_obj):
     return None
 
 
-def get_nvcl_data(reader, param_obj, height_res, x, y, z, nvcl_id):
+def get_nvcl_data(reader, height_res, x_m, y_m, z, nvcl_id):
     ''' Process the output of NVCL_kit's 'get_imagelog_data()'
 
         :param reader: NVCL_Kit object
-        :param param_obj: NVCL_Kit constructor input
         :param height_res: borehole data height resolution (float, metres)
-        :param x,y,z: x,y,z coordinates of borehole collar
+        :param x_m,y_m: x,y coordinates of borehole collar, already converted to model CRS
+        :param z: z coordinate of borehole collar
         :param nvcl_id: NVCL id of borehole
         :returns: dictionary: key: depth (float) \
                               value: SimpleNamespace('classText', 'className', 'colour') \
                   Returns empty dict upon error or no data \
-                  and 'base_xyz' - (x,y,z) converted coordinate tuple in borehole CRS
+                  and 'base_xyz' - (x,y,z) coordinate tuple in model CRS
     '''
-    x_m, y_m = convert_coords(param_obj.BOREHOLE_CRS, param_obj.MODEL_CRS,
-                              [x, y])
     base_xyz = (x_m, y_m, z)
     # Look for NVCL mineral data
     imagelog_list = reader.get_imagelog_data(nvcl_id)
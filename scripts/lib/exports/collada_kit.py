@@ -487,7 +487,7 @@ class ColladaKit(ExportKit):
                                  (z_val == 0 or y_val == 0 or x_val == 0 or \
                                  z_val == geom_obj.vol_sz[2]-1 or \
                                  y_val == geom_obj.vol_sz[1]-1 or x_val == geom_obj.vol_sz[0]-1):
-                            colour_num = calculate_false_colour_num(geom_obj.vol_data[x_val][y_val][z_val],
+                            colour_num = calculate_false_colour_num(float(geom_obj.vol_data[x_val][y_val][z_val]),
                                                                     geom_obj.get_max_data(),
                                                                     geom_obj.get_min_data(),
                                                                     self.MAX_COLOURS)
@@ -534,8 +534,10 @@ class ColladaKit(ExportKit):
         :param height_reso: height resolution for colour info dict
         :param out_filename: path & filename of COLLADA file to output, without extension
         '''
-        self.logger.debug("write_borehole(%s, %s, colour_info_dict = %s, %s)", repr(base_vrtx),
-                          repr(borehole_name), repr(colour_info_dict), repr(out_filename))
+        # 'colour_info_dict' can be large, so only make its repr when debugging
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("write_borehole(%s, %s, colour_info_dict = %s, %s)", repr(base_vrtx),
+                              repr(borehole_name), repr(colour_info_dict), repr(out_filename))
 
         mesh = Collada.Collada()
         node_list = []
@@ -4,31 +4,31 @@ Parent class for all '_kit' classes
 import logging
 import sys
 
-class ExportKit:
+# Set up logging once, at import time, so that every instance shares the same handler
+_LOGGER = logging.getLogger(__name__)
+if not _LOGGER.handlers:
+    # Create console handler
+    _HANDLER = logging.StreamHandler(sys.stdout)
 
-    def __init__(self, debug_level):
-        ''' Initialise class
-        :param debug_level: debug level taken from python's 'logging' module
-        '''
-        # Set up logging, use an attribute of class name so it is only called once
-        if not hasattr(ExportKit, 'logger'):
-            ExportKit.logger = logging.getLogger(__name__)
+    # Create formatter and add it to handler
+    _HANDLER.setFormatter(logging.Formatter('%(asctime)s -- %(name)s -- %(levelname)s - %(message)s'))
 
-            # Create console handler
-            handler = logging.StreamHandler(sys.stdout)
+    # Add handler to logger
+    _LOGGER.addHandler(_HANDLER)
 
-            # Create formatter
-            formatter = logging.Formatter('%(asctime)s -- %(name)s -- %(levelname)s - %(message)s')
 
-            # Add formatter to ch
-            handler.setFormatter(formatter)
+class ExportKit:
 
-            # Add handler to logger and set level
-            ExportKit.logger.addHandler(handler)
+    logger = _LOGGER
+    ''' Logger shared by all '_kit' classes '''
 
-        # Finally, set debug level
-        ExportKit.logger.setLevel(debug_level)
-        self.logger = ExportKit.logger
+    def __init__(self, debug_level):
+        ''' Initialise class
+        :param debug_level: debug level taken from python's 'logging' module
+        '''
+        # Set debug level
+        _LOGGER.setLevel(debug_level)
+        self.logger = _LOGGER
 
     def start_write(self):
         ''' Generic routine to start the process write out multiple GSM objects 
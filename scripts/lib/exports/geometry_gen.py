@@ -4,8 +4,89 @@ including: borehole sticks, lines, cubes and pyramids
 '''
 import math
 from types import SimpleNamespace
+import numpy
 from lib.exports.bh_utils import make_borehole_label
 
+BH_INDICES = numpy.array([0, 2, 1,
+                          3, 5, 4,
+                          1, 2, 5,
+                          2, 4, 5,
+                          0, 4, 2,
+                          0, 3, 4,
+                          0, 1, 3,
+                          1, 5, 3], dtype=numpy.uint32)
+''' Triangle indices of a borehole segment, shared by all segments and must not be modified
+'''
+BH_INDICES.flags.writeable = False
+
+BH_MISSING_COLOUR = (1.0, 1.0, 1.0, 1.0)
+''' Colour of borehole segments with missing colour and mineral information
+'''
+
+BH_SEG_DTYPE = numpy.dtype([('depth', numpy.float64), ('colour', numpy.float64, (4,)),
+                            ('classText', object), ('className', object)])
+''' numpy structured array type holding a borehole segment's depth, colour and mineral information
+'''
+
+BH_WIDTH = 10
+''' Width of borehole stick
+'''
+
+_COS_30 = math.cos(math.radians(30.0))
+_SIN_30 = math.sin(math.radians(30.0))
+
+BH_XY_OFFSETS = numpy.array([[0.0, BH_WIDTH*_COS_30],
+                             [BH_WIDTH*_COS_30, -BH_WIDTH*_SIN_30],
+                             [-BH_WIDTH*_COS_30, -BH_WIDTH*_SIN_30],
+                             [0.0, BH_WIDTH*_COS_30],
+                             [-BH_WIDTH*_COS_30, -BH_WIDTH*_SIN_30],
+                             [BH_WIDTH*_COS_30, -BH_WIDTH*_SIN_30]])
+''' (x,y) offsets from the borehole collar of the vertices of a segment's equilateral triangle \
+    cross section, order of vertices is: a_high, b_high, c_high, a_low, c_low, b_low
+'''
+BH_XY_OFFSETS.flags.writeable = False
+
+def make_borehole_verts(pos, depth_arr, ht_resol):
+    ''' Makes the vertices of all the segments of a borehole marker stick with triangular cross section
+
+    :param pos: x,y,z position of collar of borehole, tuple of 3 floats
+    :param depth_arr: numpy array of the depths of the segments, floats
+    :param ht_reso: height resolution, float
+    :returns: float32 numpy array of (x,y,z) vertices, shape (num_segments, 6, 3)
+    '''
+    # Every segment has the same equilateral triangle cross section, see 'BH_XY_OFFSETS'
+    all_verts = numpy.empty((len(depth_arr), 6, 3), dtype=numpy.float32)
+    all_verts[:, :, :2] = BH_XY_OFFSETS + (pos[0], pos[1])
+    height_arr = pos[2] + ht_resol - numpy.asarray(depth_arr, dtype=numpy.float64)
+    all_verts[:, :3, 2] = height_arr[:, numpy.newaxis]
+    all_verts[:, 3:, 2] = (height_arr - ht_resol)[:, numpy.newaxis]
+    return all_verts
+
+def make_borehole_seg_arr(colour_info_dict):
+    ''' Converts a borehole's colour info dict to a structured array, one row per segment, \
+        in the same order as the dict. Segments with missing colour and mineral information \
+        are given a blank one
+
+    :param colour_info_dict: see 'colour_borehole_gen'
+    :returns: numpy structured array of type 'BH_SEG_DTYPE'
+    '''
+    seg_arr = numpy.empty(len(colour_info_dict), dtype=BH_SEG_DTYPE)
+    seg_arr['depth'] = list(colour_info_dict.keys())
+    seg_arr['colour'] = BH_MISSING_COLOUR
+    seg_arr['classText'] = 'unknown'
+    seg_arr['className'] = 'unknown'
+    # Fill in the segments that have information a column at a time, not a row at a time
+    has_info = numpy.fromiter((isinstance(colour_info, SimpleNamespace)
+                               for colour_info in colour_info_dict.values()),
+                              dtype=bool, count=len(colour_info_dict))
+    if has_info.any():
+        info_list = [colour_info for colour_info in colour_info_dict.values()
+                     if isinstance(colour_info, SimpleNamespace)]
+        seg_arr['colour'][has_info] = [colour_info.colour for colour_info in info_list]
+        seg_arr['classText'][has_info] = [colour_info.classText for colour_info in info_list]
+        seg_arr['className'][has_info] = [colour_info.className for colour_info in info_list]
+    return seg_arr
+
 def colour_borehole_gen(pos, borehole_name, colour_info_dict, ht_resol):
     ''' A generator which is used to make a borehole marker stick with triangular cross section
 
@@ -16,8 +97,8 @@ def colour_borehole_gen(pos, borehole_name, colour_info_dict, ht_resol):
                                                 'classText': <mineral name>, \
                                                 'className': <measurement class> })
     :param ht_reso: height resolution, float
-    :returns vert_list - list of floats, (x,y,z) vertices; \
-        indices - list of integers, index pointers to which vertices are joined as triangles; \
+    :returns vert_list - float32 numpy array of (x,y,z) vertices, shape (6, 3); \
+        indices - uint32 numpy array of index pointers to which vertices are joined as triangles; \
         colour_idx - integer index pointing to material object array; \
         depth - depth of borehole segment, float; \
         rgba_colour - RGBA colour 4-tuple, floats; \
@@ -25,37 +106,18 @@ def colour_borehole_gen(pos, borehole_name, colour_info_dict, ht_resol):
                                                      'className': <measurement class> } \
         mesh_name - used to label meshes during mesh generation (bytes object)
     '''
-    bh_width = 10 # Width of stick
-
-    # Convert bv to an equilateral triangle of floats
-    angl_rad = math.radians(30.0)
-    cos_flt = math.cos(angl_rad)
-    sin_flt = math.sin(angl_rad)
+    # All the segments' vertices are stored in one array, each segment gets a view of 6 rows
+    all_verts = make_borehole_verts(pos, numpy.fromiter(colour_info_dict.keys(), dtype=numpy.float64,
+                                                        count=len(colour_info_dict)), ht_resol)
     for colour_idx, (depth, colour_info) in enumerate(colour_info_dict.items()):
-        height = pos[2]+ht_resol-depth
-        pt_a_high = [pos[0], pos[1]+bh_width*cos_flt, height]
-        pt_b_high = [pos[0]+bh_width*cos_flt, pos[1]-bh_width*sin_flt, height]
-        pt_c_high = [pos[0]-bh_width*cos_flt, pos[1]-bh_width*sin_flt, height]
-        pt_a_low = [pos[0], pos[1]+bh_width*cos_flt, height-ht_resol]
-        pt_b_low = [pos[0]+bh_width*cos_flt, pos[1]-bh_width*sin_flt, height-ht_resol]
-        pt_c_low = [pos[0]-bh_width*cos_flt, pos[1]-bh_width*sin_flt, height-ht_resol]
-
-        vert_list = pt_a_high + pt_b_high + pt_c_high + pt_a_low + pt_c_low + pt_b_low
-
-        indices = [0, 2, 1,
-                   3, 5, 4,
-                   1, 2, 5,
-                   2, 4, 5,
-                   0, 4, 2,
-                   0, 3, 4,
-                   0, 1, 3,
-                   1, 5, 3]
+        vert_list = all_verts[colour_idx]
+        indices = BH_INDICES
 
         mesh_name = make_borehole_label(borehole_name, depth)
 
         # If there is missing colour and mineral information, then add blank one
         if not isinstance(colour_info, SimpleNamespace):
-            rgba_colour = (1.0, 1.0, 1.0, 1.0)
+            rgba_colour = BH_MISSING_COLOUR
             class_dict = { 'classText': 'unknown', 'className': 'unknown'}
         else:
             rgba_colour = colour_info.colour
@@ -63,6 +125,50 @@ def colour_borehole_gen(pos, borehole_name, colour_info_dict, ht_resol):
 
         yield vert_list, indices, colour_idx, depth, rgba_colour, class_dict, mesh_name
 
+def batch_borehole_gen(pos, borehole_name, colour_info_dict, ht_resol):
+    ''' A generator which makes a borehole marker stick like 'colour_borehole_gen', but all
+    the segments of the same colour are joined together into one mesh, so there is one mesh
+    per colour instead of one mesh per segment. Meshes are yielded in order of first appearance
+    of their colour, and each takes its depth, mineral information and name from its first segment
+
+    :param pos: x,y,z position of collar of borehole, tuple of 3 floats
+    :param borehole_name: borehole's name
+    :param colour_info_dict: see 'colour_borehole_gen'
+    :param ht_reso: height resolution, float
+    :returns vert_list - float32 numpy array of (x,y,z) vertices, shape (6*num_segments, 3); \
+        indices - uint32 numpy array of index pointers to which vertices are joined as triangles; \
+        colour_idx - integer index pointing to material object array, one per colour; \
+        depth, rgba_colour, class_dict, mesh_name - see 'colour_borehole_gen'
+    '''
+    if len(colour_info_dict) == 0:
+        return
+    seg_arr = make_borehole_seg_arr(colour_info_dict)
+    all_verts = make_borehole_verts(pos, seg_arr['depth'], ht_resol)
+
+    # Number the colours in order of first appearance
+    rgba_arr = seg_arr['colour']
+    # pylint: disable=W0612
+    uniq_arr, first_idx_arr, inverse_arr = numpy.unique(rgba_arr, axis=0, return_index=True,
+                                                        return_inverse=True)
+    colour_order = numpy.argsort(first_idx_arr)
+    # Segment indices sorted by colour, keeping them in depth order within each colour
+    seg_order = numpy.argsort(inverse_arr.ravel(), kind='stable')
+    seg_groups = numpy.split(seg_order, numpy.cumsum(numpy.bincount(inverse_arr.ravel()))[:-1])
+
+    for colour_idx, uniq_idx in enumerate(colour_order):
+        seg_idx_arr = seg_groups[uniq_idx]
+        vert_arr = all_verts[seg_idx_arr].reshape(-1, 3)
+        # Each segment's indices are offset by the number of vertices before it
+        offsets = numpy.arange(0, 6*len(seg_idx_arr), 6, dtype=numpy.uint32)
+        indices = (BH_INDICES + offsets[:, numpy.newaxis]).ravel()
+        # Depth, colour, mineral information and name are taken from the first segment
+        depth, rgba_arr, class_text, class_name = seg_arr[first_idx_arr[uniq_idx]]
+        depth = float(depth)
+        rgba_colour = tuple(rgba_arr.tolist())
+        class_dict = { 'classText': class_text, 'className': class_name }
+        mesh_name = make_borehole_label(borehole_name, depth)
+        yield vert_arr, indices, colour_idx, depth, rgba_colour, class_dict, mesh_name
+
 def tri_gen(trgl_arr, vrtx_arr, mesh_name):
     ''' A generator which is used to make a triangular mesh
 
@@ -57,25 +57,15 @@ class PngKit(ExportKit):
             # If colour table is provided within source file, use it
             if colour_map:
                 self.logger.debug("Using style colour map")
+                # Pixel colours of the values found so far, the colour map is searched once per value
+                pixel_colour_dict = {}
                 for x_val in range(0, geom_obj.vol_sz[0]):
                     for y_val in range(0, geom_obj.vol_sz[1]):
                         try:
                             val = int(geom_obj.vol_data[x_val][y_val][z_val])
-                            if val in colour_map:
-                                (r_val, g_val, b_val, a_val) = colour_map[val]
-                            else:
-                                # If key val not in map, try previous one in colour map
-                                less_arr = [k for k in list(colour_map.keys()) if k < val]
-                                if len(less_arr) > 0:
-                                    col_key = less_arr[-1]
-                                    (r_val, g_val, b_val, a_val) = colour_map[col_key]
-                                    self.logger.debug(f"Colour map missing value at {val}, using {col_key} instead")
-                                else:
-                                    # Use invisible black colour if no previous one exists
-                                    (r_val, g_val, b_val, a_val) = (0.0, 0.0, 0.0, 0.0)
-                                    self.logger.warning(f"Colour map missing value at {val}, using RGBA=0,0,0,0 instead")
-                            pixel_colour = [int(r_val * 255.0), int(g_val * 255.0), int(b_val * 255.0),
-                                            int(a_val * 255.0)]
+                            if val not in pixel_colour_dict:
+                                pixel_colour_dict[val] = self.__map_pixel_colour(colour_map, val)
+                            pixel_colour = pixel_colour_dict[val]
                         except ValueError:
                             # Bad values in colour map ?
                             pixel_colour = [0, 0, 0, 0]
@@ -90,7 +80,7 @@ class PngKit(ExportKit):
                         try:
                             # pylint:disable=W0612
                             (r_val, g_val, b_val, a_val) = make_false_colour_tup(
-                                geom_obj.vol_data[x_val][y_val][z_val],
+                                float(geom_obj.vol_data[x_val][y_val][z_val]),
                                 geom_obj.get_min_data(),
                                 geom_obj.get_max_data())
                             pixel_colour = [int(r_val * 255.0), int(g_val * 255.0), int(b_val * 255.0),
@@ -115,3 +105,26 @@ class PngKit(ExportKit):
             label_str = meta_obj.name
         popup_dict = {os.path.basename(file_name): {'title': label_str, 'name': label_str}}
         return popup_dict
+
+
+    def __map_pixel_colour(self, colour_map, val):
+        ''' Looks up a value in a colour map and converts its colour to a pixel
+
+        :param colour_map: dict of colours, key is integer, value is RGBA tuple of 4 floats
+        :param val: integer value
+        :returns: [R,G,B,A] list of integer pixel colour values
+        '''
+        if val in colour_map:
+            (r_val, g_val, b_val, a_val) = colour_map[val]
+        else:
+            # If key val not in map, try previous one in colour map
+            less_arr = [k for k in list(colour_map.keys()) if k < val]
+            if len(less_arr) > 0:
+                col_key = less_arr[-1]
+                (r_val, g_val, b_val, a_val) = colour_map[col_key]
+                self.logger.debug(f"Colour map missing value at {val}, using {col_key} instead")
+            else:
+                # Use invisible black colour if no previous one exists
+                (r_val, g_val, b_val, a_val) = (0.0, 0.0, 0.0, 0.0)
+                self.logger.warning(f"Colour map missing value at {val}, using RGBA=0,0,0,0 instead")
+        return [int(r_val * 255.0), int(g_val * 255.0), int(b_val * 255.0), int(a_val * 255.0)]
@@ -17,6 +17,15 @@ class GocadFileDataStrMap(FileDataStructMap):
     ''' Constant assigns possible headers to each filename extension
     '''
 
+    HEADER_EXT = {header: ext for ext, header_list in GOCAD_HEADERS.items() if ext != 'GP'
+                  for header in header_list}
+    ''' Maps the header of each kind of GOCAD object, except groups, to its filename extension
+    '''
+
+    OBJ_START_HEADERS = frozenset(header_list[0] for header_list in GOCAD_HEADERS.values())
+    ''' Headers that mark the start of a GOCAD object within a file of joined objects
+    '''
+
     def is_points(self, filename_str):
         ''' Routine to recognise a points file
 
@@ -7,6 +7,7 @@ from collections import OrderedDict
 import logging
 import traceback
 import copy
+import itertools
 
 import numpy as np
 
@@ -18,7 +19,7 @@ from lib.db.geometry.types import VRTX, ATOM, TRGL, SEG
 from lib.db.metadata.metadata import METADATA, MapFeat
 from lib.imports.gocad.gocad_filestr_types import GocadFileDataStrMap
 
-from .helpers import make_line_gen, check_vertex
+from .helpers import make_line_gen, GrowableArray
 
 # Set up debugging
 LOCAL_LOGGER = logging.getLogger(__name__)
@@ -129,11 +130,13 @@ class GocadImporter():
     ''' Class used to read GOCAD files and store their details
     '''
     from .parsers import parse_property_header, parse_props, parse_float
-    from .parsers import parse_int, parse_xyz, parse_colour, parse_axis_unit
+    from .parsers import parse_int, parse_xyz, parse_xyz_fast, parse_colour, parse_axis_unit
     from .processors import process_coord_hdr, process_header, process_ascii_well_path
     from .processors import process_well_info, process_well_curve, process_prop_class_hdr, process_well_binary_file
-    from .processors import process_vol_data
+    from .processors import process_vol_data, process_coord_block, add_coord_block
+    from .processors import add_vrtx_props, add_vrtx_props_block
     from .volumes import read_volume_binary_files, calc_vo_xyz, calc_sg_xyz, read_region_flags_file
+    from .volumes import prefetch_volume_files, calc_vo_extent, calc_vo_axis_terms, calc_sg_extent
 
     SUPPORTED_EXTS = [
         'TS',
@@ -165,6 +168,39 @@ class GocadImporter():
     ''' Line width for drawing wells
     '''
 
+    SKIP_KEYWORDS = frozenset(("SUBVSET", "ILINE", "TFACE", "TVOLUME", "CNP"))
+    ''' Keywords of lines that are skipped: subsets and control nodes (fixed points in GOCAD)
+    '''
+
+    BULK_MIN_FIELDS = {"VRTX": 5, "PVRTX": 5, "TRGL": 4}
+    ''' Keywords of lines that are converted in bulk, and minimum number of fields in the line
+    '''
+
+    VOL_XYZ_ATTRS = {"AXIS_U": "axis_u", "AXIS_V": "axis_v", "AXIS_W": "axis_w",
+                     "AXIS_MIN": "axis_min", "AXIS_MAX": "axis_max"}
+    ''' VOXET and SGRID keywords followed by X,Y,Z floats, and the attribute they are stored in
+    '''
+
+    VOL_INT_ATTRS = {"FLAGS_ARRAY_LENGTH": "flags_array_length",
+                     "FLAGS_BIT_LENGTH": "flags_bit_length",
+                     "FLAGS_ESIZE": "flags_bit_size",
+                     "FLAGS_OFFSET": "flags_offset",
+                     "REGION_FLAGS_ARRAY_LENGTH": "region_flags_array_length",
+                     "REGION_FLAGS_BIT_LENGTH": "region_flags_bit_length",
+                     "REGION_FLAGS_ESIZE": "region_flags_bit_size",
+                     "REGION_FLAGS_OFFSET": "region_flags_offset",
+                     "POINTS_OFFSET": "points_offset"}
+    ''' VOXET and SGRID keywords followed by an integer, and the attribute it is stored in
+    '''
+
+    VOL_SKIP_KEYWORDS = frozenset(("AXIS_NAME", "AXIS_TYPE", "AXIS_D", "AXIS_LABEL_MAX"))
+    ''' VOXET and SGRID keywords that are ignored
+    '''
+
+    VOL_UNSUPPORTED_KEYWORDS = frozenset(("ASCII_DATA_FILE", "SPLIT", "FACET_SET"))
+    ''' VOXET and SGRID keywords that are recognised but cannot be processed
+    '''
+
 
     def __init__(self, debug_level, base_xyz=(0.0, 0.0, 0.0), group_name="",
                  nondefault_coords=False, stop_on_exc=True, ct_file_dict={}):
@@ -226,6 +262,11 @@ class GocadImporter():
             it and for SGRID files
         '''
 
+        self._dbg = False
+        ''' True iff debug messages are logged, set at the start of 'process_gocad()' so that
+            debug messages for every line can be skipped without calling the logger
+        '''
+
         self.invert_zaxis = False
         ''' Set to true if z-axis inversion is turned on in this GOCAD file
         '''
@@ -234,6 +275,11 @@ class GocadImporter():
         ''' OrderedDict of PROPS objects for attached PVRTX and PATOM properties
         '''
 
+        self._local_props_tup = ()
+        ''' Tuple of the PROPS objects in 'local_props', in order. It is made once, when
+            the properties are declared, and used when parsing each line of properties
+        '''
+
         self._is_ts = False
         ''' True iff it is a GOCAD TSURF file
         '''
@@ -266,16 +312,25 @@ class GocadImporter():
         ''' Units of XYZ axes
         '''
 
-        self._vrtx_arr = []
-        ''' Array of named tuples 'VRTX' used to store vertex data
+        self._vrtx_n = GrowableArray(np.int64)
+        self._vrtx_xyz = GrowableArray(np.float64, 3)
+        ''' Vertex data, stored as an array of sequence numbers and an array of (X,Y,Z)
         '''
 
         self._atom_arr = []
         ''' Array of named tuples 'ATOM' used to store atom data
         '''
 
-        self._trgl_arr = []
-        ''' Array of named tuples 'TRGL' used store triangle face data
+        self._vert_dict = {}
+        self._vrtx_idx = {}
+        self._vert_dict_sz = (0, 0)
+        ''' Cached vertex dictionary, first index of each vertex number,
+            and the number of vertices and atoms they were built from
+        '''
+
+        self._trgl_abc = GrowableArray(np.int64, 3)
+        ''' Triangle face data, stored as an array of vertex sequence numbers (A,B,C)
+            The triangle's sequence number is the same as A
         '''
 
         self._seg_arr = []
@@ -330,6 +385,10 @@ class GocadImporter():
         ''' Name of flags file associated with voxel file
         '''
 
+        self.region_flags_file = ""
+        ''' Name of region flags file associated with SGRID file
+        '''
+
         self.points_offset = 0
         ''' Offset within points file (SGRID)
         '''
@@ -405,11 +464,8 @@ class GocadImporter():
     def __repr__(self):
         ''' A basic print friendly representation
         '''
-        ret_str = ''
-        for field in dir(self):
-            if field[-2:] != '__' and not callable(getattr(self, field)):
-                ret_str += field + ": " + repr(getattr(self, field))[:200] + "\n"
-        return ret_str
+        return ''.join(f"{field}: {repr(getattr(self, field))[:200]}\n" for field in dir(self)
+                       if field[-2:] != '__' and not callable(getattr(self, field)))
 
 
     def __make_vertex_dict(self):
@@ -417,49 +473,351 @@ class GocadImporter():
             Ordinarily the vertex sequence number is the same as the insertion order in the vertex
             array, but some GOCAD files have missing vertices etc.
             The first element starts at '1'
+            The dictionary is cached, it is only rebuilt when vertices have been added,
+            newly added atoms are appended to it
         '''
-        vert_dict = {}
-        # Assign vertices to dict
-        for idx, vrtx in enumerate(self._vrtx_arr, 1):
-            vert_dict[vrtx.n] = idx
+        num_vrtx = len(self._vrtx_n)
+        if num_vrtx != self._vert_dict_sz[0]:
+            # Assign vertices to dict
+            vrtx_n_list = self._vrtx_n.arr.tolist()
+            self._vert_dict = {vrtx_n: idx for idx, vrtx_n in enumerate(vrtx_n_list, 1)}
+            # Atoms refer to the first vertex with a matching sequence number
+            self._vrtx_idx = {}
+            for idx, vrtx_n in enumerate(vrtx_n_list, 1):
+                self._vrtx_idx.setdefault(vrtx_n, idx)
+            atom_start = 0
+        else:
+            atom_start = self._vert_dict_sz[1]
 
         # Assign atoms to dict
-        for atom in self._atom_arr:
-            for idx, vert in enumerate(self._vrtx_arr, 1):
-                if vert.n == atom.v:
-                    vert_dict[atom.n] = idx
-                    break
-        return vert_dict
+        for atom in self._atom_arr[atom_start:]:
+            idx = self._vrtx_idx.get(atom.v)
+            if idx is not None:
+                self._vert_dict[atom.n] = idx
+        self._vert_dict_sz = (num_vrtx, len(self._atom_arr))
+        return self._vert_dict
+
+
+    def __handle_properties(self, field, field_raw, src_dir):
+        ''' Property names (PROPERTIES), this is not the class names,
+            or property names for the point properties (PROPERTY_CLASSES) e.g. PVRTX, PATOM
+        '''
+        if not self.local_props:
+            for class_name in field[1:]:
+                self.local_props[class_name] = PROPS(class_name, self.logger.getEffectiveLevel())
+            self._local_props_tup = tuple(self.local_props.values())
+        self.logger.debug(" properties list = %s", repr(field[1:]))
+
+
+    def __handle_esizes(self, field, field_raw, src_dir):
+        ''' This is the number of floats/ints for each property, usually it is '1',
+            but XYZ values are '3'
+        '''
+        for idx, prop_obj in enumerate(self._local_props_tup, 1):
+            is_ok, d_sz = self.parse_int(field[idx])
+            if is_ok:
+                prop_obj.data_sz = d_sz
+        self.logger.debug(" property_sizes = %s", repr(field[1:]))
+
+
+    def __handle_no_data_values(self, field, field_raw, src_dir):
+        ''' Read values representing no data for this property at a coordinate point
+        '''
+        for idx, prop_obj in enumerate(self._local_props_tup, 1):
+            try:
+                converted, fltp = self.parse_float(field[idx])
+                if converted:
+                    prop_obj.no_data_marker = fltp
+                    self.logger.debug("prop_obj.no_data_marker = %f",
+                                      prop_obj.no_data_marker)
+            except IndexError as exc:
+                self.handle_exc(exc)
+        self.logger.debug(" property_nulls = %s", repr(field[1:]))
+
+
+    def __handle_atom(self, field, field_raw, src_dir):
+        ''' Atoms, with or without properties
+        '''
+        is_ok_s, seq_no = self.parse_int(field[1])
+        is_ok, v_num = self.parse_int(field[2])
+        if not is_ok_s or not is_ok:
+            return
+        self.__make_vertex_dict()
+        if v_num in self._vrtx_idx:
+            self._atom_arr.append(ATOM(seq_no, v_num))
+        else:
+            self.logger.error("ATOM refers to VERTEX that has not been defined yet")
+            self.logger.error("    seq_no = %d", seq_no)
+            self.logger.error("    v_num = %d", v_num)
+            self.logger.error("    line = %s", " ".join(field))
+            sys.exit(1)
+
+        # Atoms with attached properties
+        if field[0] == "PATOM":
+            vert_dict = self.__make_vertex_dict()
+            self.parse_props(field,
+                             tuple(self._vrtx_xyz.arr[vert_dict[v_num] - 1].tolist()),
+                             True)
+
+
+    def __handle_vrtx(self, field, field_raw, src_dir):
+        ''' Grab the vertices and properties, does not care if there are
+            gaps in the sequence number
+            NB: Runs of vertices are normally converted in bulk by 'process_coord_block()'
+        '''
+        try:
+            seq_no = int(field[1])
+            x_flt, y_flt, z_flt = self.parse_xyz_fast(field[2], field[3], field[4], True)
+            is_ok_s = is_ok = True
+        except (OverflowError, ValueError):
+            # Uncommon values e.g. infinities are handled by the slower parsers
+            is_ok_s, seq_no = self.parse_int(field[1])
+            is_ok, x_flt, y_flt, z_flt = self.parse_xyz(True, field[2], field[3],
+                                                        field[4], True)
+        if self._dbg:
+            self.logger.debug("ParseXYZ %s %f %f %f from %s %s %s", repr(is_ok),
+                              x_flt, y_flt, z_flt,
+                              field[2], field[3], field[4])
+        if is_ok_s and is_ok:
+            # Add vertex
+            if self.invert_zaxis:
+                z_flt = -1.0 * z_flt
+            self._vrtx_n.append(seq_no)
+            self._vrtx_xyz.append((x_flt, y_flt, z_flt))
+
+            # Vertices with attached properties
+            if field[0] == "PVRTX":
+                self.parse_props(field, (x_flt, y_flt, z_flt))
+
+
+    def __handle_trgl(self, field, field_raw, src_dir):
+        ''' Grab the triangular edges
+            NB: Runs of triangles are normally converted in bulk by 'process_coord_block()'
+        '''
+        is_ok_s, seq_no = self.parse_int(field[1])
+        is_ok, a_int, b_int, c_int = self.parse_xyz(False, field[1], field[2],
+                                                    field[3], False, False)
+        if is_ok and is_ok_s:
+            self._trgl_abc.append((a_int, b_int, c_int))
+
+
+    def __handle_seg(self, field, field_raw, src_dir):
+        ''' Grab the segments
+        '''
+        is_ok_a, a_int = self.parse_int(field[1])
+        is_ok_b, b_int = self.parse_int(field[2])
+        if is_ok_a and is_ok_b:
+            self._seg_arr.append(SEG((a_int, b_int)))
+
 
+    def __handle_geofeat(self, field, field_raw, src_dir):
+        ''' Grab metadata - see 'metadata.py' for more info
+        '''
+        self.meta_obj.geofeat_name = field[1]
+        if field[0] == 'STRATIGRAPHIC_POSITION':
+            is_ok, self.meta_obj.geoevent_numeric_age_range = \
+                                   self.parse_int(field[-1:][0], 0)
+            self.meta_obj.mapped_feat = MapFeat.GEOLOGICAL_UNIT
+
+
+    def __handle_geol_type(self, field, field_raw, src_dir):
+        ''' Grab metadata - type of geological feature
+        '''
+        if field[1] == "FAULT":
+            self.meta_obj.mapped_feat = MapFeat.SHEAR_DISP_STRUCT
+        elif  field[1] == "INTRUSIVE":
+            self.meta_obj.mapped_feat = MapFeat.GEOLOGICAL_UNIT
+        elif field[1] in ("BOUNDARY", "UNCONFORMITY", "INTRAFORMATIONAL"):
+            self.meta_obj.mapped_feat = MapFeat.CONTACT
+
+
+    def __handle_prop_subclass(self, field, field_raw, src_dir):
+        ''' What kind of property is this? Is it a measurement,
+            or a reference to a rock colour table?
+        '''
+        if len(field) > 2 and field[2] == "ROCK":
+            prop_idx = field[1]
+            self.prop_dict[prop_idx].is_index_data = True
+            self.logger.debug("self.prop_dict[%s].is_index_data = True", prop_idx)
+            # Sometimes there is an array of indexes and labels
+            self.logger.debug(" len(field) = %d", len(field))
+            if len(field) > 4:
+                for idx in range(4, len(field), 2):
+                    rock_label = field[idx]
+                    is_ok, int_val = self.parse_int(field[1+idx])
+                    if is_ok:
+                        rock_index = int_val
+                        self.rock_label_idx.setdefault(prop_idx, {})
+                        self.rock_label_idx[prop_idx][rock_index] = rock_label
+                        self.logger.debug("self.rock_label_idx[%s] = %s",
+                                          prop_idx, repr(self.rock_label_idx[prop_idx]))
+
+
+    def __handle_prop_file(self, field, field_raw, src_dir):
+        ''' Extract binary file name
+        '''
+        self.prop_dict[field[1]].file_name = os.path.join(src_dir, field_raw[2])
+        self.logger.debug("self.prop_dict[%s].file_name = %s",
+                          field[1], self.prop_dict[field[1]].file_name)
+
+
+    def __handle_prop_esize(self, field, field_raw, src_dir):
+        ''' Size of each value in binary file (measured in bytes, usually 1,2,4)
+        '''
+        is_ok, int_val = self.parse_int(field[2])
+        if is_ok:
+            self.prop_dict[field[1]].data_sz = int_val
+            self.logger.debug("self.prop_dict[%s].data_sz = %d", field[1],
+                              self.prop_dict[field[1]].data_sz)
+
+
+    def __handle_prop_storage_type(self, field, field_raw, src_dir):
+        ''' The type of non-float value in binary file: OCTET, SHORT, RGBA
+            IF this is present, then it is assumed not to be floating point
+        '''
+        # Single byte integer
+        if field[2] == "OCTET":
+            self.prop_dict[field[1]].data_type = "b"
+        # Short int, 2 bytes long
+        elif field[2] == "SHORT":
+            self.prop_dict[field[1]].data_type = "h"
+        # Colour data
+        elif field[2] == "RGBA":
+            self.prop_dict[field[1]].data_type = "rgba"
+        else:
+            self.logger.error("Unknown type %s", field[2])
+            sys.exit(1)
+        self.logger.debug("self.prop_dict[%s].data_type = %s",
+                          field[1], self.prop_dict[field[1]].data_type)
+
+
+    def __handle_prop_signed(self, field, field_raw, src_dir):
+        ''' If binary file contains integers, are they signed integers?
+        '''
+        self.prop_dict[field[1]].signed_int = (field[2] == "1")
+        self.logger.debug("self.prop_dict[%s].signed_int = %s",
+                          field[1],
+                          repr(self.prop_dict[field[1]].signed_int))
+
+
+    def __handle_prop_etype(self, field, field_raw, src_dir):
+        ''' Type of value in binary file: IBM, IEEE
+            NB: We do not support IBM-style floats
+        '''
+        if field[2] != "IEEE":
+            self.logger.error("Cannot process %s type floating points", field[1])
+            sys.exit(1)
+
+
+    def __handle_prop_eformat(self, field, field_raw, src_dir):
+        ''' Binary file format: RAW or SEGY
+            NB: Cannot process SEGY formats
+        '''
+        if field[2] != "RAW":
+            self.logger.error("Cannot process %s format volume data", field[1])
+            sys.exit(1)
+
+
+    def __handle_prop_offset(self, field, field_raw, src_dir):
+        ''' Offset in bytes within binary file
+        '''
+        is_ok, int_val = self.parse_int(field[2])
+        if is_ok:
+            self.prop_dict[field[1]].offset = int_val
+            self.logger.debug("self.prop_dict[%s].offset = %d",
+                              field[1], self.prop_dict[field[1]].offset)
+
+
+    def __handle_prop_no_data_value(self, field, field_raw, src_dir):
+        ''' The number that is used to represent 'no data' in binary file
+        '''
+        converted, fltp = self.parse_float(field[2])
+        if converted:
+            self.prop_dict[field[1]].no_data_marker = fltp
+            self.logger.debug("self.prop_dict[%s].no_data_marker = %f",
+                              field[1],
+                              self.prop_dict[field[1]].no_data_marker)
+
+
+    @staticmethod
+    def __count_vrtx_trgl(file_lines):
+        ''' Quickly counts the vertex and triangle lines in a GOCAD file
+
+        :param file_lines: list of strings of lines from gocad file
+        :returns: number of VRTX & PVRTX lines, number of TRGL lines
+        '''
+        num_vrtx = 0
+        num_trgl = 0
+        for line in file_lines:
+            if line.startswith(('VRTX', 'PVRTX')):
+                num_vrtx += 1
+            elif line.startswith('TRGL'):
+                num_trgl += 1
+        return num_vrtx, num_trgl
 
     def process_gocad(self, src_dir, filename_str, file_lines):
         ''' Extracts details from gocad file. This should be called before other functions!
 
         :param filename_str: filename of gocad file
-        :param file_lines: array of strings of lines from gocad file
+        :param file_lines: array of strings of lines from gocad file, or any iterable of lines
+                           e.g. an open file, which is then read one line at a time
         :returns: true if could process file, and a list of (geometry, style, metadata) objects
         '''
-        self.logger.debug("process_gocad(%s,%s,%d)", src_dir, filename_str, len(file_lines))
+        self.logger.debug("process_gocad(%s,%s)", src_dir, filename_str)
+        self._dbg = self.logger.isEnabledFor(logging.DEBUG)
 
         ret_val = True
 
-        debug_lvl = self.logger.getEffectiveLevel()
-
-        # For keeping track of the ID of VRTX, ATOM, PVRTX, SEG etc.
-        seq_no = 0
-        seq_no_prev = -1
+        # Handlers for keywords that only need the current line, these apply to all files
+        common_handlers = {
+            "PROPERTIES": self.__handle_properties,
+            "PROPERTY_CLASSES": self.__handle_properties,
+            "ESIZES": self.__handle_esizes,
+            "NO_DATA_VALUES": self.__handle_no_data_values,
+        }
+        # Handlers for keywords that only need the current line, these do not apply to wells
+        body_handlers = {
+            "ATOM": self.__handle_atom,
+            "PATOM": self.__handle_atom,
+            "VRTX": self.__handle_vrtx,
+            "PVRTX": self.__handle_vrtx,
+            "TRGL": self.__handle_trgl,
+            "SEG": self.__handle_seg,
+            "STRATIGRAPHIC_POSITION": self.__handle_geofeat,
+            "GEOLOGICAL_FEATURE": self.__handle_geofeat,
+            "GEOLOGICAL_TYPE": self.__handle_geol_type,
+            "PROPERTY_SUBCLASS": self.__handle_prop_subclass,
+            "PROP_FILE": self.__handle_prop_file,
+            "PROP_ESIZE": self.__handle_prop_esize,
+            "PROP_STORAGE_TYPE": self.__handle_prop_storage_type,
+            "PROP_SIGNED": self.__handle_prop_signed,
+            "PROP_ETYPE": self.__handle_prop_etype,
+            "PROP_EFORMAT": self.__handle_prop_eformat,
+            "PROP_OFFSET": self.__handle_prop_offset,
+            "PROP_NO_DATA_VALUE": self.__handle_prop_no_data_value,
+        }
 
         file_name, file_ext = os.path.splitext(filename_str)
         self.np_filename = os.path.basename(file_name)
 
         # Check that we have a GOCAD file that we can process
         # Nota bene: This will return if called for the header of a GOCAD group file
-        if not self.__set_type(file_ext, file_lines[0].rstrip(' \n\r').upper()):
+        line_iter = iter(file_lines)
+        first_line = next(line_iter, '')
+        if not self.__set_type(file_ext, first_line.rstrip(' \n\r').upper()):
             self.logger.error("process_gocad() Can't detect GOCAD file object type, return False")
             return False, []
 
+        # If all the lines are at hand, count the vertices and triangles so their arrays
+        # can be allocated once, rather than grown as the lines are parsed
+        if isinstance(file_lines, (list, tuple)):
+            num_vrtx, num_trgl = self.__count_vrtx_trgl(file_lines)
+            self._vrtx_n.reserve(num_vrtx)
+            self._vrtx_xyz.reserve(num_vrtx)
+            self._trgl_abc.reserve(num_trgl)
+
         # Create a line generator to parse each line
-        line_gen = make_line_gen(file_lines)
+        line_gen = make_line_gen(itertools.chain((first_line,), line_iter))
         is_last = False
         # Retry flag forces parsing of the field array without asking for the next line
         retry = False
@@ -470,20 +828,35 @@ class GocadImporter():
             if is_last and not field:
                 break
 
-            self.logger.debug(f"field = {field} field_raw={field_raw} line_str = {line_str} is_last = {is_last}") 
-            # Skip the subsets keywords
-            if field[0] in ["SUBVSET", "ILINE", "TFACE", "TVOLUME"]:
-                self.logger.debug("Skip subset keywords")
+            if self._dbg:
+                self.logger.debug("field = %s field_raw=%s line_str = %s is_last = %s",
+                                  field, field_raw, line_str, is_last)
+            keyword = field[0]
+            # Skip the subsets keywords and control nodes
+            if keyword in self.SKIP_KEYWORDS:
+                if self._dbg:
+                    self.logger.debug("Skip subset keywords and control nodes")
                 continue
 
-            # Skip control nodes (used to denote fixed points in GOCAD)
-            if field[0] == "CNP":
-                self.logger.debug("Skip control nodes")
-                continue
+            handler = common_handlers.get(keyword)
+            if handler is None and not self._is_wl:
+                handler = body_handlers.get(keyword)
+            bulk_min_fields = self.BULK_MIN_FIELDS.get(keyword)
 
             try:
+                # Runs of vertices and triangles are converted in bulk
+                if bulk_min_fields is not None and len(field) >= bulk_min_fields \
+                                               and not self._is_wl:
+                    field, field_raw, line_str, is_last = self.process_coord_block(line_gen,
+                                                          field, field_raw, line_str, is_last)
+                    retry = True
+
+                # Keywords that only need the current line
+                elif handler is not None:
+                    handler(field, field_raw, src_dir)
+
                 # Are we in the main header?
-                if field[0] == "HEADER":
+                elif field[0] == "HEADER":
                     self.logger.debug("Processing header")
                     is_last = self.process_header(line_gen)
 
@@ -501,42 +874,6 @@ class GocadImporter():
                     self.logger.debug("Processing property class header")
                     is_last = self.process_prop_class_hdr(line_gen, field)
 
-                # Property names, this is not the class names
-                elif field[0] == "PROPERTIES":
-                    if not self.local_props:
-                        for class_name in field[1:]:
-                            self.local_props[class_name] = PROPS(class_name, debug_lvl)
-                    self.logger.debug(" properties list = %s", repr(field[1:]))
-
-                # These are the property names for the point properties (e.g. PVRTX, PATOM)
-                elif field[0] == "PROPERTY_CLASSES":
-                    if not self.local_props:
-                        for class_name in field[1:]:
-                            self.local_props[class_name] = PROPS(class_name, debug_lvl)
-                    self.logger.debug(" property classes = %s", repr(field[1:]))
-
-                # This is the number of floats/ints for each property, usually it is '1',
-                # but XYZ values are '3'
-                elif field[0] == "ESIZES":
-                    for idx, prop_obj in enumerate(self.local_props.values(), 1):
-                        is_ok, d_sz = self.parse_int(field[idx])
-                        if is_ok:
-                            prop_obj.data_sz = d_sz
-                    self.logger.debug(" property_sizes = %s", repr(field[1:]))
-
-                # Read values representing no data for this property at a coordinate point
-                elif field[0] == "NO_DATA_VALUES":
-                    for idx, prop_obj in enumerate(self.local_props.values(), 1):
-                        try:
-                            converted, fltp = self.parse_float(field[idx])
-                            if converted:
-                                prop_obj.no_data_marker = fltp
-                                self.logger.debug("prop_obj.no_data_marker = %f",
-                                                  prop_obj.no_data_marker)
-                        except IndexError as exc:
-                            self.handle_exc(exc)
-                    self.logger.debug(" property_nulls = %s", repr(field[1:]))
-
                 # If a well object
                 elif self._is_wl:
                     # All well files
@@ -546,13 +883,14 @@ class GocadImporter():
 
                         # Convert well path into a series of SEG types
                         if len(well_path) > 1:
-                            self._vrtx_arr.append(VRTX(1, well_path[0]))
+                            self._vrtx_n.extend(range(1, len(well_path) + 1))
+                            self._vrtx_xyz.extend(well_path)
                             for idx in range(1, len(well_path)):
                                 self._seg_arr.append(SEG((idx, idx + 1)))
-                                self._vrtx_arr.append(VRTX(idx + 1, well_path[idx]))
                              
-                        self.logger.debug(f"Well path: {well_path}")
-                        self.logger.debug(f"Label list: {self.meta_obj.label_list}")
+                        if self._dbg:
+                            self.logger.debug(f"Well path: {well_path}")
+                            self.logger.debug(f"Label list: {self.meta_obj.label_list}")
                         retry = True
 
                     # Well files with well curve block
@@ -566,184 +904,16 @@ class GocadImporter():
                         self.logger.debug(f"Opening well binary file: {bin_file}")
                         # NB: Not used yet
                         self.well_bin_file_data = self.process_well_binary_file(bin_file)
-                        self.logger.debug(f"bin_flts={self.well_bin_file_data[:40]}")
+                        if self._dbg:
+                            self.logger.debug(f"bin_flts={self.well_bin_file_data[:40]}")
 
                     elif field[0] == "WP_CATALOG_FILE":
                         bin_file = os.path.join(src_dir, field_raw[1])
                         self.logger.debug(f"Opening well wp catalog file: {bin_file}")
                         # NB: Not used yet
                         self.well_wp_file_data = self.process_well_binary_file(bin_file)
-                        self.logger.debug(f"p_flts={self.well_wp_file_data[:40]}")
-
-                # Atoms, with or without properties
-                elif field[0] == "ATOM" or field[0] == 'PATOM':
-                    seq_no_prev = seq_no
-                    is_ok_s, seq_no = self.parse_int(field[1])
-                    is_ok, v_num = self.parse_int(field[2])
-                    if not is_ok_s or not is_ok:
-                        seq_no = seq_no_prev
-                    else:
-                        if check_vertex(v_num, self._vrtx_arr):
-                            self._atom_arr.append(ATOM(seq_no, v_num))
-                        else:
-                            self.logger.error("ATOM refers to VERTEX that has not been defined yet")
-                            self.logger.error("    seq_no = %d", seq_no)
-                            self.logger.error("    v_num = %d", v_num)
-                            self.logger.error("    line = %s", line_str)
-                            sys.exit(1)
-
-                        # Atoms with attached properties
-                        if field[0] == "PATOM":
-                            vert_dict = self.__make_vertex_dict()
-                            self.parse_props(field, self._vrtx_arr[vert_dict[v_num] - 1].xyz,
-                                             True)
-
-                # Grab the vertices and properties, does not care if there are
-                # gaps in the sequence number
-                elif field[0] == "PVRTX" or  field[0] == "VRTX":
-                    seq_no_prev = seq_no
-                    is_ok_s, seq_no = self.parse_int(field[1])
-                    is_ok, x_flt, y_flt, z_flt = self.parse_xyz(True, field[2], field[3],
-                                                                field[4], True)
-                    self.logger.debug("ParseXYZ %s %f %f %f from %s %s %s", repr(is_ok),
-                                      x_flt, y_flt, z_flt,
-                                      field[2], field[3], field[4])
-                    if not is_ok_s or not is_ok:
-                        seq_no = seq_no_prev
-                    else:
-                        # Add vertex
-                        if self.invert_zaxis:
-                            z_flt = -1.0 * z_flt
-                        self._vrtx_arr.append(VRTX(seq_no, (x_flt, y_flt, z_flt)))
-
-                        # Vertices with attached properties
-                        if field[0] == "PVRTX":
-                            self.parse_props(field, (x_flt, y_flt, z_flt))
-
-                # Grab the triangular edges
-                elif field[0] == "TRGL":
-                    seq_no_prev = seq_no
-                    is_ok_s, seq_no = self.parse_int(field[1])
-                    is_ok, a_int, b_int, c_int = self.parse_xyz(False, field[1], field[2],
-                                                                field[3], False, False)
-                    if not is_ok or not is_ok_s:
-                        seq_no = seq_no_prev
-                    else:
-                        self._trgl_arr.append(TRGL(seq_no, (a_int, b_int, c_int)))
-
-                # Grab the segments
-                elif field[0] == "SEG":
-                    is_ok_a, a_int = self.parse_int(field[1])
-                    is_ok_b, b_int = self.parse_int(field[2])
-                    if is_ok_a and is_ok_b:
-                        self._seg_arr.append(SEG((a_int, b_int)))
-
-                # Grab metadata - see 'metadata.py' for more info
-                elif field[0] in ("STRATIGRAPHIC_POSITION", "GEOLOGICAL_FEATURE"):
-                    self.meta_obj.geofeat_name = field[1]
-                    if field[0] == 'STRATIGRAPHIC_POSITION':
-                        is_ok, self.meta_obj.geoevent_numeric_age_range = \
-                                               self.parse_int(field[-1:][0], 0)
-                        self.meta_obj.mapped_feat = MapFeat.GEOLOGICAL_UNIT
-
-                elif field[0] == "GEOLOGICAL_TYPE":
-                    if field[1] == "FAULT":
-                        self.meta_obj.mapped_feat = MapFeat.SHEAR_DISP_STRUCT
-                    elif  field[1] == "INTRUSIVE":
-                        self.meta_obj.mapped_feat = MapFeat.GEOLOGICAL_UNIT
-                    elif field[1] in ("BOUNDARY", "UNCONFORMITY", "INTRAFORMATIONAL"):
-                        self.meta_obj.mapped_feat = MapFeat.CONTACT
-
-
-                # What kind of property is this? Is it a measurement,
-                # or a reference to a rock colour table?
-                elif field[0] == "PROPERTY_SUBCLASS":
-                    if len(field) > 2 and field[2] == "ROCK":
-                        prop_idx = field[1]
-                        self.prop_dict[prop_idx].is_index_data = True
-                        self.logger.debug("self.prop_dict[%s].is_index_data = True", prop_idx)
-                        # Sometimes there is an array of indexes and labels
-                        self.logger.debug(" len(field) = %d", len(field))
-                        if len(field) > 4:
-                            for idx in range(4, len(field), 2):
-                                rock_label = field[idx]
-                                is_ok, int_val = self.parse_int(field[1+idx])
-                                if is_ok:
-                                    rock_index = int_val
-                                    self.rock_label_idx.setdefault(prop_idx, {})
-                                    self.rock_label_idx[prop_idx][rock_index] = rock_label
-                                    self.logger.debug("self.rock_label_idx[%s] = %s",
-                                                      prop_idx, repr(self.rock_label_idx[prop_idx]))
-
-                # Extract binary file name
-                elif field[0] == "PROP_FILE":
-                    self.prop_dict[field[1]].file_name = os.path.join(src_dir, field_raw[2])
-                    self.logger.debug("self.prop_dict[%s].file_name = %s",
-                                      field[1], self.prop_dict[field[1]].file_name)
-
-                # Size of each value in binary file (measured in bytes, usually 1,2,4)
-                elif field[0] == "PROP_ESIZE":
-                    is_ok, int_val = self.parse_int(field[2])
-                    if is_ok:
-                        self.prop_dict[field[1]].data_sz = int_val
-                        self.logger.debug("self.prop_dict[%s].data_sz = %d", field[1],
-                                          self.prop_dict[field[1]].data_sz)
-
-                # The type of non-float value in binary file: OCTET, SHORT, RGBA
-                # IF this is present, then it is assumed not to be floating point
-                elif field[0] == "PROP_STORAGE_TYPE":
-                    # Single byte integer
-                    if field[2] == "OCTET":
-                        self.prop_dict[field[1]].data_type = "b"
-                    # Short int, 2 bytes long
-                    elif field[2] == "SHORT":
-                        self.prop_dict[field[1]].data_type = "h"
-                    # Colour data
-                    elif field[2] == "RGBA":
-                        self.prop_dict[field[1]].data_type = "rgba"
-                    else:
-                        self.logger.error("Unknown type %s", field[2])
-                        sys.exit(1)
-                    self.logger.debug("self.prop_dict[%s].data_type = %s",
-                                      field[1], self.prop_dict[field[1]].data_type)
-
-                # If binary file contains integers, are they signed integers?
-                elif field[0] == "PROP_SIGNED":
-                    self.prop_dict[field[1]].signed_int = (field[2] == "1")
-                    self.logger.debug("self.prop_dict[%s].signed_int = %s",
-                                      field[1],
-                                      repr(self.prop_dict[field[1]].signed_int))
-
-                # Type of value in binary file: IBM, IEEE
-                # NB: We do not support IBM-style floats
-                elif field[0] == "PROP_ETYPE":
-                    if field[2] != "IEEE":
-                        self.logger.error("Cannot process %s type floating points", field[1])
-                        sys.exit(1)
-
-                # Binary file format: RAW or SEGY
-                # NB: Cannot process SEGY formats
-                elif field[0] == "PROP_EFORMAT":
-                    if field[2] != "RAW":
-                        self.logger.error("Cannot process %s format volume data", field[1])
-                        sys.exit(1)
-
-                # Offset in bytes within binary file
-                elif field[0] == "PROP_OFFSET":
-                    is_ok, int_val = self.parse_int(field[2])
-                    if is_ok:
-                        self.prop_dict[field[1]].offset = int_val
-                        self.logger.debug("self.prop_dict[%s].offset = %d",
-                                          field[1], self.prop_dict[field[1]].offset)
-
-                # The number that is used to represent 'no data' in binary file
-                elif field[0] == "PROP_NO_DATA_VALUE":
-                    converted, fltp = self.parse_float(field[2])
-                    if converted:
-                        self.prop_dict[field[1]].no_data_marker = fltp
-                        self.logger.debug("self.prop_dict[%s].no_data_marker = %f",
-                                          field[1],
-                                          self.prop_dict[field[1]].no_data_marker)
+                        if self._dbg:
+                            self.logger.debug(f"p_flts={self.well_wp_file_data[:40]}")
 
                 # Process VOXET data
                 elif self._is_vo and field[0][:4] == "AXIS":
@@ -797,7 +967,8 @@ class GocadImporter():
 
         # Complete initialisation of metadata object
 
-        self.logger.debug(f"process_gocad() returns {ret_val} {self.gsm_list}")
+        if self._dbg:
+            self.logger.debug(f"process_gocad() returns {ret_val} {self.gsm_list}")
         return ret_val, self.gsm_list
 
 
@@ -885,13 +1056,12 @@ class GocadImporter():
 
         # Re-enumerate all geometries, because some GOCAD files have missing vertex numbers
         vert_dict = self.__make_vertex_dict()
-        for v_old in self._vrtx_arr:
-            vrtx = VRTX(vert_dict[v_old.n], v_old.xyz)
+        for v_n, v_xyz in zip(self._vrtx_n.arr.tolist(), self._vrtx_xyz.arr.tolist()):
+            vrtx = VRTX(vert_dict[v_n], tuple(v_xyz))
             geom_obj.vrtx_arr.append(vrtx)
 
-        for t_old in self._trgl_arr:
-            tri = TRGL(t_old.n, (vert_dict[t_old.abc[0]], vert_dict[t_old.abc[1]],
-                                 vert_dict[t_old.abc[2]]))
+        for t_a, t_b, t_c in self._trgl_abc.arr.tolist():
+            tri = TRGL(t_a, (vert_dict[t_a], vert_dict[t_b], vert_dict[t_c]))
             geom_obj.trgl_arr.append(tri)
 
         for s_old in self._seg_arr:
@@ -940,13 +1110,8 @@ class GocadImporter():
         ext_str = file_ext.lstrip('.').upper()
         # Look for other GOCAD file types within a group file
         if ext_str == 'GP':
-            found = False
-            for key in GocadFileDataStrMap.GOCAD_HEADERS:
-                if key != 'GP' and first_line_str in GocadFileDataStrMap.GOCAD_HEADERS[key]:
-                    ext_str = key
-                    found = True
-                    break
-            if not found:
+            ext_str = GocadFileDataStrMap.HEADER_EXT.get(first_line_str)
+            if ext_str is None:
                 return False
 
         if ext_str in GocadFileDataStrMap.GOCAD_HEADERS:
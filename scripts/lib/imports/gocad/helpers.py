@@ -2,8 +2,11 @@
 A collection GOCAD helper functions
 """
 import logging
+import re
 import sys
 
+import numpy as np
+
 from lib.imports.gocad.gocad_filestr_types import GocadFileDataStrMap
 
 # Set up debugging
@@ -21,24 +24,91 @@ LOCAL_HANDLER.setFormatter(LOCAL_FORMATTER)
 # Add handler to logger
 LOCAL_LOGGER.addHandler(LOCAL_HANDLER)
 
+QUOTED_LABEL_RE = re.compile(r'"([^"]*)"')
+''' Matches a double-quoted label, the label is in group 1
+'''
+
+RAW_FIELD_KEYWORDS = frozenset(("PROP_FILE", "FLAGS_FILE", "REGION_FLAGS_FILE", "POINTS_FILE",
+                                "BINARY_DATA_FILE", "WP_CATALOG_FILE"))
+''' Keywords of lines whose fields are needed in their original case e.g. filenames
+'''
+
+
+class GrowableArray:
+    ''' A numpy array that rows can be appended to, capacity is doubled when it runs out
+        so appending is amortised O(1) and the rows stay in one contiguous block
+    '''
+
+    INIT_CAPACITY = 64
+    ''' Number of rows allocated on first append
+    '''
+
+    def __init__(self, dtype, width=None):
+        '''
+        :param dtype: numpy dtype of array elements
+        :param width: number of columns, or None for a 1-dimensional array
+        '''
+        self._row_shape = () if width is None else (width,)
+        self._buf = np.empty((0,) + self._row_shape, dtype=dtype)
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def reserve(self, num_rows):
+        ''' Makes sure there is room for 'num_rows' more rows, so they can be appended
+            without the buffer being reallocated
+
+        :param num_rows: number of rows to make room for
+        '''
+        needed = self._len + num_rows
+        if needed > self._buf.shape[0]:
+            capacity = max(needed, 2 * self._buf.shape[0], self.INIT_CAPACITY)
+            new_buf = np.empty((capacity,) + self._row_shape, dtype=self._buf.dtype)
+            new_buf[:self._len] = self._buf[:self._len]
+            self._buf = new_buf
+
+    def append(self, row):
+        ''' Appends one row
+
+        :param row: a value, or a sequence of 'width' values
+        '''
+        self.reserve(1)
+        self._buf[self._len] = row
+        self._len += 1
+
+    def extend(self, rows):
+        ''' Appends many rows
+
+        :param rows: numpy array (or anything convertible to one) of rows
+        '''
+        rows = np.asarray(rows, dtype=self._buf.dtype)
+        self.reserve(rows.shape[0])
+        self._buf[self._len:self._len + rows.shape[0]] = rows
+        self._len += rows.shape[0]
+
+    @property
+    def arr(self):
+        ''' :returns: numpy array view of the rows appended so far
+        '''
+        return self._buf[:self._len]
+
 
 def split_gocad_objs(filename_lines):
     ''' Separates joined GOCAD entries within a file
 
     :param filename_lines: lines from concatenated GOCAD file
     '''
-    gocad_headers = GocadFileDataStrMap.GOCAD_HEADERS
+    start_headers = GocadFileDataStrMap.OBJ_START_HEADERS
     file_lines_list = []
     part_list = []
     in_file = False
     for line in filename_lines:
         line_str = line.rstrip(' \n\r').upper()
         if not in_file:
-            for marker in gocad_headers.values():
-                if line_str == marker[0]:
-                    in_file = True
-                    part_list.append(line)
-                    break
+            if line_str in start_headers:
+                in_file = True
+                part_list.append(line)
         elif in_file:
             part_list.append(line)
             if line_str == 'END':
@@ -60,6 +130,15 @@ def check_vertex(num, vrtx_arr):
     return False
 
 
+def _sub_quoted_label(match):
+    ''' Substitution function used to remove double quotes from labels
+
+    :param match: regular expression match object for QUOTED_LABEL_RE
+    :returns: label with spaces replaced by underscores, padded with spaces
+    '''
+    return " " + match.group(1).strip(' ').replace(' ', '_') + " "
+
+
 def _parse_quoted_labels(line_str):
     ''' Look out for double-quoted label strings and substitute underscores
 
@@ -67,12 +146,9 @@ def _parse_quoted_labels(line_str):
     :reurns: all double-quoted labels with spaces now have double quotes removed and underscores
              substituted for labels
     '''
-    while line_str.count('"') >= 2:
-        before_tup = line_str.partition('"')
-        after_tup = before_tup[2].partition('"')
-        line_str = before_tup[0] + " " + after_tup[0].strip(' ').replace(' ', '_') \
-                   + " " + after_tup[2]
-    return line_str
+    if '"' not in line_str:
+        return line_str
+    return QUOTED_LABEL_RE.sub(_sub_quoted_label, line_str)
 
 
 def _parse_quoted_filename(line):
@@ -93,25 +169,36 @@ def make_line_gen(file_lines):
     ''' This is a Python generator function that processes lines of the GOCAD object file
         and returns each line in various forms, from quite unprocessed to fully processed
 
-    :param filename_str: filename of gocad file
-    :param file_lines: array of strings of lines from gocad file
+    :param file_lines: array of strings of lines from gocad file, or any iterable of lines
+                       e.g. an open file
     :returns: array of field strings in upper case with double quotes removed from strings,
-             array of field string in original case without double quotes removed,
+             array of field string in original case without double quotes removed
+             (only for keywords in RAW_FIELD_KEYWORDS, otherwise same as first array),
              line of GOCAD file in upper case,
              boolean, True iff it is the last line of the file
     '''
-    for line in file_lines:
-        line_str = line.rstrip(' \n\r').upper()
+    # Look one line ahead, so the last line is known without holding all lines in memory
+    line_iter = iter(file_lines)
+    next_line = next(line_iter, None)
+    while next_line is not None:
+        line = next_line
+        next_line = next(line_iter, None)
+        line_rstrip = line.rstrip(' \n\r')
 
         # Split up the string, substituting underscores for spaces in doubled quoted labels
-        line_str = _parse_quoted_labels(line_str)
+        line_str = _parse_quoted_labels(line_rstrip.upper())
         splitstr_arr = line_str.split()
 
-        # Split up the string, correctly parsing quoted filename
-        splitstr_arr_raw = _parse_quoted_filename(line.rstrip(' \n\r'))
-
         # Skip blank lines
         if not splitstr_arr:
             continue
-        yield splitstr_arr, splitstr_arr_raw, line_str, line == file_lines[-1:][0]
+
+        # Split up the string, correctly parsing quoted filename
+        # Only done for lines with filenames, other lines are only tokenised once
+        if splitstr_arr[0] in RAW_FIELD_KEYWORDS:
+            splitstr_arr_raw = _parse_quoted_filename(line_rstrip)
+        else:
+            splitstr_arr_raw = splitstr_arr
+
+        yield splitstr_arr, splitstr_arr_raw, line_str, next_line is None
     yield [], [], '', True
@@ -4,6 +4,7 @@ Functions that process fields in a single line of a GOCAD file
 
 
 import sys
+import math
 
 def parse_property_header(self, prop_obj, line_str):
     ''' Parses the PROPERTY header, extracting the colour table info
@@ -58,24 +59,25 @@ def parse_props(self, field, coord_tup, is_patom=False):
         col_idx = 5
 
     # Loop over each property in line
-    for prop_obj in self.local_props.values():
+    for prop_obj in self._local_props_tup:
         # Property has one float
         if prop_obj.data_sz == 1:
             fp_str = field[col_idx]
             # Skip GOCAD control nodes e.g. 'CNXY', 'CNXYZ'
-            if fp_str[:2].upper() == 'CN':
+            if fp_str.startswith('CN'):
                 col_idx += 1
                 fp_str = field[col_idx]
             converted, fltp = self.parse_float(fp_str, prop_obj.no_data_marker)
             if converted:
                 prop_obj.assign_to_xyz(coord_tup, fltp)
-                self.logger.debug("prop_obj.data_xyz[%s] = %f", repr(coord_tup), fltp)
+                if self._dbg:
+                    self.logger.debug("prop_obj.data_xyz[%s] = %f", repr(coord_tup), fltp)
             col_idx += 1
         # Property has 3 floats i.e. XYZ
         elif prop_obj.data_sz == 3:
             fp_str_x = field[col_idx]
             # Skip GOCAD control nodes e.g. 'CNXY', 'CNXYZ'
-            if fp_str_x[:2].upper() == 'CN':
+            if fp_str_x.startswith('CN'):
                 col_idx += 1
                 fp_str_x = field[col_idx]
             fp_str_y = field[col_idx+1]
@@ -85,8 +87,9 @@ def parse_props(self, field, coord_tup, is_patom=False):
             converted_z, fp_z = self.parse_float(fp_str_z, prop_obj.no_data_marker)
             if converted_z and converted_y and converted_x:
                 prop_obj.assign_to_xyz(coord_tup, (fp_x, fp_y, fp_z))
-                self.logger.debug("prop_obj.data_xyz[%s] = (%f,%f,%f)",
-                                  repr(coord_tup), fp_x, fp_y, fp_z)
+                if self._dbg:
+                    self.logger.debug("prop_obj.data_xyz[%s] = (%f,%f,%f)",
+                                      repr(coord_tup), fp_x, fp_y, fp_z)
             col_idx += 3
         else:
             self.logger.error("Cannot process property size of != 3 and !=1: %d %s",
@@ -179,6 +182,31 @@ def parse_xyz(self, is_float, x_str, y_str, z_str, do_minmax=False, convert=True
     return True, x_val, y_val, z_val
 
 
+def parse_xyz_fast(self, x_str, y_str, z_str, do_minmax=False):
+    ''' Faster version of 'parse_xyz()' for floating point XYZ coordinates in the usual form.
+        Instead of returning a success flag it raises an exception, the caller can then
+        fall back to 'parse_xyz()' to handle infinities, bad values etc.
+
+    :param x_str, y_str, z_str: X,Y,Z coordinates in string form
+    :param do_minmax: calculate min/max of the X,Y,Z coords
+    :returns: x,y,z - floating point values, converted to metres if units are kms
+    :raises ValueError, OverflowError: if the strings could not be converted to finite floats
+    '''
+    x_mult, y_mult, z_mult = self.xyz_mult
+    x_val = float(x_str) * x_mult
+    y_val = float(y_str) * y_mult
+    z_val = float(z_str) * z_mult
+    if not math.isfinite(x_val + y_val + z_val):
+        raise ValueError("non-finite coordinate")
+
+    # Calculate and store minimum and maximum XYZ
+    if do_minmax:
+        self.geom_obj.calc_minmax(x_val, y_val, z_val)
+        x_base, y_base, z_base = self.base_xyz
+        return x_val + x_base, y_val + y_base, z_val + z_base
+    return x_val, y_val, z_val
+
+
 
 def parse_colour(self, colour_str):
     ''' Parse a colour string into RGBA tuple.
@@ -199,9 +227,14 @@ def parse_colour(self, colour_str):
             else:
                 self.logger.debug("Could not parse colour %s", repr(colour_str))
         else:
-            rgba_tup = (float(int(colour_str[1:3], 16))/255.0,
-                        float(int(colour_str[3:5], 16))/255.0,
-                        float(int(colour_str[5:7], 16))/255.0, 1.0)
+            # Parse all 6 hex digits at once, then split into channels
+            hex_str = colour_str[1:7]
+            if len(hex_str) != 6:
+                raise ValueError(f"Short hex colour string {colour_str!r}")
+            rgb_int = int(hex_str, 16)
+            rgba_tup = (((rgb_int >> 16) & 0xff) / 255.0,
+                        ((rgb_int >> 8) & 0xff) / 255.0,
+                        (rgb_int & 0xff) / 255.0, 1.0)
     except (ValueError, OverflowError, IndexError) as exc:
         self.handle_exc(exc)
         rgba_tup = (1.0, 1.0, 1.0, 1.0)
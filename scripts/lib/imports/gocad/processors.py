@@ -226,7 +226,8 @@ def process_ascii_well_path(self, line_gen, field):
                     ok2, dia2 = to_dia(field)
                     if ok1 and ok2:
                         x_d, y_d, z_d = to_xyz_min_curve(dia1, dia2)
-                        self.logger.debug(f"Converted from {prev_stat} to {field} => {x_d}, {y_d}, {z_d}")
+                        if self._dbg:
+                            self.logger.debug(f"Converted from {prev_stat} to {field} => {x_d}, {y_d}, {z_d}")
                         if len(well_path) > 0 and (x_d, y_d, z_d) != (0.0, 0.0, 0.0):
                             old_x = well_path[-1][0]
                             old_y = well_path[-1][1]
@@ -317,7 +318,8 @@ def process_ascii_well_path(self, line_gen, field):
             break
 
 
-    self.logger.debug(f"END ascii well path = {well_path[1:]} marker_list = {marker_list}")
+    if self._dbg:
+        self.logger.debug(f"END ascii well path = {well_path[1:]} marker_list = {marker_list}")
 
     # Do not return the first element in well_path, it is a WREF, not a PATH
     return is_last, well_path[1:], marker_list
@@ -468,142 +470,66 @@ def process_vol_data(self, line_gen, field, field_raw, src_dir):
     '''
     self.logger.info("START process_vol_data(field = %s)", repr(field))
     while True:
-        self.logger.debug(f"process_vol_data processing: field={field}")
-        if field[0] == "AXIS_O":
-            is_ok, x_flt, y_flt, z_flt = self.parse_xyz(True, field[1], field[2],
-                                                        field[3], True)
-            if is_ok:
-                self.axis_o = (x_flt, y_flt, z_flt)
-                self.logger.debug(f"self.axis_o = {self.axis_o}")
-
-        elif field[0] == "AXIS_U":
+        if self._dbg:
+            self.logger.debug("process_vol_data processing: field=%s", field)
+        keyword = field[0]
+        if keyword in self.VOL_XYZ_ATTRS:
             is_ok, x_flt, y_flt, z_flt = self.parse_xyz(True, field[1], field[2],
                                                         field[3], False, False)
             if is_ok:
-                self.axis_u = (x_flt, y_flt, z_flt)
-                self.logger.debug(f"self.axis_u = {self.axis_u}")
+                setattr(self, self.VOL_XYZ_ATTRS[keyword], (x_flt, y_flt, z_flt))
+                self.logger.debug("self.%s = %s", self.VOL_XYZ_ATTRS[keyword],
+                                  (x_flt, y_flt, z_flt))
 
-        elif field[0] == "AXIS_V":
-            is_ok, x_flt, y_flt, z_flt = self.parse_xyz(True, field[1], field[2],
-                                                        field[3], False, False)
+        elif keyword in self.VOL_INT_ATTRS:
+            is_ok, int_val = self.parse_int(field[1])
             if is_ok:
-                self.axis_v = (x_flt, y_flt, z_flt)
-                self.logger.debug(f"self.axis_v = {self.axis_v}")
+                setattr(self, self.VOL_INT_ATTRS[keyword], int_val)
+                self.logger.debug("self.%s = %d", self.VOL_INT_ATTRS[keyword], int_val)
+
+        elif keyword in self.VOL_SKIP_KEYWORDS:
+            pass
 
-        elif field[0] == "AXIS_W":
+        elif keyword in self.VOL_UNSUPPORTED_KEYWORDS:
+            self.logger.warning("Sorry - cannot process %s keyword", keyword)
+
+        elif keyword == "AXIS_O":
             is_ok, x_flt, y_flt, z_flt = self.parse_xyz(True, field[1], field[2],
-                                                        field[3], False, False)
+                                                        field[3], True)
             if is_ok:
-                self.axis_w = (x_flt, y_flt, z_flt)
-                self.logger.debug(f"self.axis_w={self.axis_w}")
+                self.axis_o = (x_flt, y_flt, z_flt)
+                self.logger.debug(f"self.axis_o = {self.axis_o}")
 
-        elif field[0] == "AXIS_N":
+        elif keyword == "AXIS_N":
             is_ok, x_int, y_int, z_int = self.parse_xyz(False, field[1], field[2],
                                                         field[3], False, False)
             if is_ok:
                 self.vol_sz = (x_int, y_int, z_int)
                 self.logger.debug(f"self.vol_sz={self.vol_sz}")
 
-        elif field[0] == "AXIS_MIN":
-            is_ok, x_flt, y_flt, z_flt = self.parse_xyz(True, field[1], field[2],
-                                                        field[3], False, False)
-            if is_ok:
-                self.axis_min = (x_flt, y_flt, z_flt)
-                self.logger.debug(f"self.axis_min={self.axis_min}")
-
-        elif field[0] == "AXIS_MAX":
-            is_ok, x_flt, y_flt, z_flt = self.parse_xyz(True, field[1], field[2],
-                                                        field[3], False, False)
-            if is_ok:
-                self.axis_max = (x_flt, y_flt, z_flt)
-                self.logger.debug(f"self.axis_max={self.axis_max}")
-
-        elif field[0] == "AXIS_UNIT":
+        elif keyword == "AXIS_UNIT":
             self.parse_axis_unit(field)
 
-        elif field[0] in ["AXIS_NAME", "AXIS_TYPE", "AXIS_D", "AXIS_LABEL_MAX"]:
-            pass
-
-        elif field[0] == "FLAGS_ARRAY_LENGTH":
-            is_ok, int_val = self.parse_int(field[1])
-            if is_ok:
-                self.flags_array_length = int_val
-                self.logger.debug(f"self.flags_array_length={self.flags_array_length}")
-
-        elif field[0] == "FLAGS_BIT_LENGTH":
-            is_ok, int_val = self.parse_int(field[1])
-            if is_ok:
-                self.flags_bit_length = int_val
-                self.logger.debug(f"self.flags_bit_length={self.flags_bit_length}")
-
-        elif field[0] == "FLAGS_ESIZE":
-            is_ok, int_val = self.parse_int(field[1])
-            if is_ok:
-                self.flags_bit_size = int_val
-                self.logger.debug(f"self.flags_bit_size={self.flags_bit_size}")
-
-        elif field[0] == "FLAGS_OFFSET":
-            is_ok, int_val = self.parse_int(field[1])
-            if is_ok:
-                self.flags_offset = int_val
-                self.logger.debug(f"self.flags_offset={self.flags_offset}")
-
-        elif field[0] == "FLAGS_FILE":
+        elif keyword == "FLAGS_FILE":
             self.flags_file = os.path.join(src_dir, field_raw[1])
             self.logger.debug(f"self.flags_file={self.flags_file}")
 
-        elif field[0] == "REGION":
+        elif keyword == "REGION":
             self.region_dict[field[2]] = field[1]
             self.logger.debug(f"self.region_dict[{field[2]}]={field[1]}")
 
-        elif field[0] == "REGION_FLAGS_ARRAY_LENGTH":
-            is_ok, int_val = self.parse_int(field[1])
-            if is_ok:
-                self.region_flags_array_length = int_val
-
-        elif field[0] == "REGION_FLAGS_BIT_LENGTH":
-            is_ok, int_val = self.parse_int(field[1])
-            if is_ok:
-                self.region_flags_bit_length = int_val
-
-        elif field[0] == "REGION_FLAGS_ESIZE":
-            is_ok, int_val = self.parse_int(field[1])
-            if is_ok:
-                self.region_flags_bit_size = int_val
-
-        elif field[0] == "REGION_FLAGS_OFFSET":
-            is_ok, int_val = self.parse_int(field[1])
-            if is_ok:
-                self.region_flags_offset = int_val
-
-        elif field[0] == "REGION_FLAGS_FILE":
+        elif keyword == "REGION_FLAGS_FILE":
             self.region_flags_file = os.path.join(src_dir, field_raw[1])
             self.logger.debug(f"self.flags_file={self.flags_file}")
 
-        elif field[0] == "ASCII_DATA_FILE":
-            self.logger.warning("Sorry - cannot process ASCII_DATA_FILE keyword")
-
-        elif field[0] == "SPLIT":
-            self.logger.warning("Sorry - cannot process SPLIT keyword")
-
-        elif field[0] == "FACET_SET":
-            self.logger.warning("Sorry - cannot process FACET_SET keyword")
-
-        elif field[0] == "PROP_ALIGNMENT":
+        elif keyword == "PROP_ALIGNMENT":
             # Is the SGRID aligned to CELLS or POINTS ?
             self.sgrid_cell_alignment = (field[1] == "CELLS")
             # If aligned to cells then there are fewer data values
             if self.sgrid_cell_alignment:
                 self.vol_sz = (self.vol_sz[0] - 1, self.vol_sz[1] - 1, self.vol_sz[2] - 1)
 
-        elif field[0] == "POINTS_OFFSET":
-            # Offset within points file
-            is_ok, int_val = self.parse_int(field[1])
-            if is_ok:
-                self.points_offset = int_val
-                self.logger.debug(f"self.points_offset={self.points_offset}")
-
-        elif field[0] == "POINTS_FILE":
+        elif keyword == "POINTS_FILE":
             # Name of points file
             self.points_file = os.path.join(src_dir, field_raw[1])
             self.logger.debug(f"self.points_file={self.points_file}")
@@ -616,3 +542,154 @@ def process_vol_data(self, line_gen, field, field_raw, src_dir):
         field, field_raw, line_str, is_last = next(line_gen)
         if is_last:
             return field, field_raw, True
+
+
+def process_coord_block(self, line_gen, field, field_raw, line_str, is_last):
+    ''' Process a run of consecutive VRTX, PVRTX or TRGL lines in one go.
+        The tokens of the whole run are converted to numpy arrays at once,
+        rather than one parse_int()/parse_xyz() call per line
+
+        :param line_gen: line generator
+        :param field: array of field strings, first line of the run
+        :param field_raw: array of field strings, not space separated
+        :param line_str: line of GOCAD file in upper case
+        :param is_last: True iff this is the last line of the file
+        :returns: field, field_raw, line_str of the first line after the run and
+                  a flag, True iff there are no more lines to process
+    '''
+    keyword = field[0]
+    num_tok = self.BULK_MIN_FIELDS[keyword]
+    block = []
+    while field and field[0] == keyword and len(field) >= num_tok:
+        block.append(field)
+        if is_last:
+            field, field_raw, line_str = [], [], ''
+            break
+        # pylint: disable=W0612
+        field, field_raw, line_str, is_last = next(line_gen)
+    self.add_coord_block(block, keyword)
+    # The line after the run still has to be processed, even if it is the last line
+    return field, field_raw, line_str, not field
+
+
+def add_coord_block(self, block, keyword):
+    ''' Converts a block of VRTX, PVRTX or TRGL lines and adds them to the vertex or
+        triangle arrays, PVRTX properties are then parsed line by line
+        Falls back to converting line by line if the block cannot be converted in bulk
+
+        :param block: list of field string arrays, all starting with 'keyword'
+        :param keyword: 'VRTX', 'PVRTX' or 'TRGL'
+    '''
+    is_vrtx = keyword != "TRGL"
+    try:
+        if is_vrtx:
+            str_arr = np.array([field[1:5] for field in block])
+            seq_arr = str_arr[:, 0].astype(np.int64)
+            xyz_arr = str_arr[:, 1:].astype(np.float64)
+            if not np.isfinite(xyz_arr).all():
+                raise ValueError("non-finite coordinate")
+        else:
+            xyz_arr = np.array([field[1:4] for field in block]).astype(np.int64)
+    except (OverflowError, ValueError):
+        # Infinities, bad tokens etc. are handled line by line
+        for field in block:
+            is_ok_s, seq_no = self.parse_int(field[1])
+            xyz_str = field[2:5] if is_vrtx else field[1:4]
+            is_ok, x_val, y_val, z_val = self.parse_xyz(is_vrtx, *xyz_str, is_vrtx, is_vrtx)
+            if not is_ok_s or not is_ok:
+                continue
+            if not is_vrtx:
+                self._trgl_abc.append((x_val, y_val, z_val))
+                continue
+            if self.invert_zaxis:
+                z_val = -1.0 * z_val
+            self._vrtx_n.append(seq_no)
+            self._vrtx_xyz.append((x_val, y_val, z_val))
+            if keyword == "PVRTX":
+                self.add_vrtx_props(field, (x_val, y_val, z_val))
+        return
+
+    if not is_vrtx:
+        self._trgl_abc.extend(xyz_arr)
+        return
+
+    # Min/max is calculated after converting units but before adding base, as in parse_xyz()
+    # Scaling preserves order, so only the block's min and max need converting
+    mult_arr = np.array(self.xyz_mult, dtype=np.float64)
+    self.geom_obj.calc_minmax(*(xyz_arr.min(axis=0) * mult_arr))
+    self.geom_obj.calc_minmax(*(xyz_arr.max(axis=0) * mult_arr))
+
+    # Convert units, add base and invert z-axis as one affine transform
+    # These settings are fixed by the header, in the usual case of metres, no base and
+    # no z-axis inversion the transform does nothing, so its passes over the block are skipped
+    base_arr = np.array(self.base_xyz, dtype=np.float64)
+    if self.invert_zaxis:
+        mult_arr[2] = -mult_arr[2]
+        base_arr[2] = -base_arr[2]
+    if (mult_arr != 1.0).any():
+        xyz_arr *= mult_arr
+    if base_arr.any():
+        xyz_arr += base_arr
+    self._vrtx_n.extend(seq_arr)
+    self._vrtx_xyz.extend(xyz_arr)
+
+    # Vertices with attached properties
+    if keyword == "PVRTX":
+        xyz_list = list(map(tuple, xyz_arr.tolist()))
+        if not self.add_vrtx_props_block(block, xyz_list):
+            for field, xyz in zip(block, xyz_list):
+                self.add_vrtx_props(field, xyz)
+
+
+def add_vrtx_props_block(self, block, xyz_list):
+    ''' Converts the properties of a block of PVRTX lines in one go, rather than calling
+        'parse_props()' for each line. Nothing is converted unless all the lines have
+        the expected columns of finite floats, uncommon lines e.g. with GOCAD control nodes
+        or infinities are left for 'parse_props()'
+
+        :param block: list of field string arrays of PVRTX lines
+        :param xyz_list: list of (X,Y,Z) float tuples of the vertices
+        :returns: True if the properties were converted
+    '''
+    if any(prop_obj.data_sz not in (1, 3) for prop_obj in self._local_props_tup):
+        return False
+    # For PVRTX, properties start at the 6th column
+    num_cols = sum(prop_obj.data_sz for prop_obj in self._local_props_tup)
+    try:
+        val_arr = np.array([field[5:5 + num_cols] for field in block]).astype(np.float64)
+    except (OverflowError, ValueError):
+        return False
+    if val_arr.shape != (len(block), num_cols) or not np.isfinite(val_arr).all():
+        return False
+
+    col_idx = 0
+    for prop_obj in self._local_props_tup:
+        prop_arr = val_arr[:, col_idx:col_idx + prop_obj.data_sz]
+        col_idx += prop_obj.data_sz
+        # Skip 'no data' values
+        if prop_obj.no_data_marker is None:
+            valid_arr = np.ones(len(block), dtype=bool)
+        else:
+            valid_arr = (prop_arr != prop_obj.no_data_marker).all(axis=1)
+        valid_xyz_list = [xyz for xyz, is_valid in zip(xyz_list, valid_arr.tolist()) if is_valid]
+        if prop_obj.data_sz == 1:
+            prop_obj.assign_list_to_xyz(valid_xyz_list, prop_arr[valid_arr, 0].tolist())
+        else:
+            prop_obj.assign_list_to_xyz(valid_xyz_list,
+                                        list(map(tuple, prop_arr[valid_arr].tolist())))
+    if self._dbg:
+        self.logger.debug("Converted properties of %d PVRTX lines", len(block))
+    return True
+
+
+def add_vrtx_props(self, field, xyz):
+    ''' Parses the properties of one PVRTX line, a malformed line does not stop the
+        rest of its block from being processed
+
+        :param field: array of field strings of PVRTX line
+        :param xyz: (X,Y,Z) float tuple of the vertex
+    '''
+    try:
+        self.parse_props(field, xyz)
+    except IndexError as exc:
+        self.handle_exc(exc)
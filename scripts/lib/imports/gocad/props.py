@@ -99,26 +99,32 @@ class PROPS:
         ''' Offset within binary file
         '''
 
+        self._dtype = None
+        self._dtype_key = None
+        ''' Cached result of 'make_numpy_dtype()' and the (data_type, signed_int, data_sz)
+            it was made from
+        '''
+
 
     def __repr__(self):
         ''' A print friendly representation
         '''
-        return "\nPROPS START\n  self = {:}\n".format(hex(id(self))) + \
-               "  file_name = {:}\n".format(repr(self.file_name)) + \
-               "  data_sz = {:d}\n".format(self.data_sz) + \
-               "  data_type = {:}\n".format(repr(self.data_type)) + \
-               "  signed_int = {:}\n".format(repr(self.signed_int)) + \
-               "  data_3d = {:}\n".format(repr(self.data_3d)) + \
-               "  data_xyz = {:}\n".format(repr(self.data_xyz)) + \
-               "  data_stats = {:}\n".format(repr(self.data_stats)) + \
-               "  colour_map = {:}\n".format(repr(self.colour_map)) + \
-               "  colourmap_name = {:}\n".format(self.colourmap_name) + \
-               "  class_name = {:}\n".format(self.class_name) + \
-               "  no_data_marker = {:}\n".format(repr(self.no_data_marker)) + \
-               "  is_index_data = {:}\n".format(repr(self.is_index_data)) + \
-               "  rock_label_table = {:}\n".format(repr(self.rock_label_table)) + \
-               "  str_data_type = {:}\n".format(repr(self.get_str_data_type())) + \
-               "PROPS END\n\n"
+        return (f"\nPROPS START\n  self = {hex(id(self))}\n"
+                f"  file_name = {self.file_name!r}\n"
+                f"  data_sz = {self.data_sz:d}\n"
+                f"  data_type = {self.data_type!r}\n"
+                f"  signed_int = {self.signed_int!r}\n"
+                f"  data_3d = {self.data_3d!r}\n"
+                f"  data_xyz = {self.data_xyz!r}\n"
+                f"  data_stats = {self.data_stats!r}\n"
+                f"  colour_map = {self.colour_map!r}\n"
+                f"  colourmap_name = {self.colourmap_name}\n"
+                f"  class_name = {self.class_name}\n"
+                f"  no_data_marker = {self.no_data_marker!r}\n"
+                f"  is_index_data = {self.is_index_data!r}\n"
+                f"  rock_label_table = {self.rock_label_table!r}\n"
+                f"  str_data_type = {self.get_str_data_type()!r}\n"
+                "PROPS END\n\n")
 
 
     def get_str_data_type(self):
@@ -143,6 +149,17 @@ class PROPS:
     def make_numpy_dtype(self):
         ''' Returns a string that can be passed to 'numpy' to read a binary file
             It takes the 'data_type' of 'f', 'b', h' & 'rgba'
+            The result is cached until 'data_type', 'signed_int' or 'data_sz' change
+        '''
+        dtype_key = (self.data_type, self.signed_int, self.data_sz)
+        if self._dtype_key != dtype_key:
+            self._dtype = self.__calc_numpy_dtype()
+            self._dtype_key = dtype_key
+        return self._dtype
+
+
+    def __calc_numpy_dtype(self):
+        ''' Makes the 'numpy' dtype for 'make_numpy_dtype()'
         '''
         # Prepare 'numpy' binary float integer signed/unsigned data types
         # Using '>' to tell 'numpy' that it is big-endian
@@ -221,6 +238,17 @@ class PROPS:
             self.__calc_minmax(val)
 
 
+    def assign_list_to_xyz(self, xyz_list, val_list):
+        ''' Assigns a list of values to xyz dict
+            xyz_list - list of (X,Y,Z) tuple array indexes (floats)
+            val_list - list of values to be assigned (all floats or all tuples)
+        '''
+        self.data_xyz.update(zip(xyz_list, val_list))
+        if val_list and isinstance(val_list[0], float):
+            self.__calc_minmax(max(val_list))
+            self.__calc_minmax(min(val_list))
+
+
     def append_to_xyz(self, xyz, val):
         ''' Appends a value to xyz dict
             xyz - (X,Y,Z) tuple array indexes (floats)
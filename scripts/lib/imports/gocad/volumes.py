@@ -14,23 +14,27 @@ def read_volume_binary_files(self):
                           "missing 'AXIS_N'")
         return False
 
-    # pylint: disable=W0612
-    for file_idx, prop_obj in self.prop_dict.items():
-        has_values = False
-
-        # Sometimes filename needs a .vo on the end
+    # Sometimes filename needs a .vo on the end
+    for prop_obj in self.prop_dict.values():
         if not os.path.isfile(prop_obj.file_name) and prop_obj.file_name[-2:] == "@@" and \
                                       os.path.isfile(prop_obj.file_name + ".vo"):
             prop_obj.file_name += ".vo"
 
+    self.prefetch_volume_files()
+
+    # pylint: disable=W0612
+    for file_idx, prop_obj in self.prop_dict.items():
+        has_values = False
+
         # If there is a colour table in CSV file then read it
         bin_file = os.path.basename(prop_obj.file_name)
         if bin_file in self.ct_file_dict:
             csv_file_path = os.path.join(os.path.dirname(prop_obj.file_name),
                                          self.ct_file_dict[bin_file][0])
             prop_obj.read_colour_table_csv(csv_file_path, self.ct_file_dict[bin_file][1])
-            self.logger.debug(f"prop_obj.colour_map = {prop_obj.colour_map}")
-            self.logger.debug(f"prop_obj.rock_label_table = {prop_obj.rock_label_table}")
+            if self._dbg:
+                self.logger.debug(f"prop_obj.colour_map = {prop_obj.colour_map}")
+                self.logger.debug(f"prop_obj.rock_label_table = {prop_obj.rock_label_table}")
 
         # Read and process binary file
         try:
@@ -44,16 +48,21 @@ def read_volume_binary_files(self):
                                   " is less than estimated size ({est_sz}): {prop_obj.file_name}")
                 return False
 
-            # Initialise data array to zeros
-            prop_obj.data_3d = np.zeros((self.vol_sz[0], self.vol_sz[1], self.vol_sz[2]))
-
             # Prepare 'numpy' dtype object for binary float, integer signed/unsigned data types
             d_typ = prop_obj.make_numpy_dtype()
 
-            # Read entire file, assumes file small enough to store in memory
+            # Initialise data array to zeros
+            # 1 & 2 byte integers and 4 byte floats are held exactly by 4 byte floats
+            # Fortran order (x varying fastest) matches the byte order of the data file
+            vol_dtype = np.float64 if d_typ.itemsize > 4 else np.float32
+            prop_obj.data_3d = np.zeros((self.vol_sz[0], self.vol_sz[1], self.vol_sz[2]),
+                                        dtype=vol_dtype, order='F')
+
+            # Memory map the file, pages are only read in as the voxels are visited
             self.logger.info(f"Reading binary file: {prop_obj.file_name}")
             elem_offset = prop_obj.offset // prop_obj.data_sz
-            fp_arr = np.fromfile(prop_obj.file_name, dtype=d_typ, count=num_voxels + elem_offset)
+            fp_arr = np.memmap(prop_obj.file_name, dtype=d_typ, mode='r',
+                               shape=(num_voxels + elem_offset,))
             self.logger.debug(f"fp_arr.shape={fp_arr.shape}")
             fp_idx = elem_offset
             # Calculate max val
@@ -68,32 +77,50 @@ def read_volume_binary_files(self):
                 mult = [(self.axis_max[0] - self.axis_min[0]) / self.vol_sz[0],
                         (self.axis_max[1] - self.axis_min[1]) / self.vol_sz[1],
                         (self.axis_max[2] - self.axis_min[2]) / self.vol_sz[2]]
-                # Loop over points in volume
-                for z_val in range(self.vol_sz[2]):
-                    for y_val in range(self.vol_sz[1]):
-                        for x_val in range(self.vol_sz[0]):
-                            x_coord, y_coord, z_coord = self.calc_vo_xyz(x_val, y_val, z_val, mult)
-                            # If numeric VOXET
-                            if prop_obj.data_type != 'rgba':
-                                converted, data_val = self.parse_float(fp_arr[fp_idx],
-                                                           prop_obj.no_data_marker)
-                                if not converted:
-                                    fp_idx += 1
-                                    continue
-                                has_values = True
-                                prop_obj.assign_to_3d(x_val, y_val, z_val, data_val)
-                            # If RGBA VOXET
-                            else:
+                self.calc_vo_extent(mult)
+
+                # If numeric VOXET, process the whole volume as an array
+                if prop_obj.data_type != 'rgba':
+                    # Voxels are stored with x varying fastest, then y, then z
+                    data_arr = fp_arr[fp_idx:].reshape(
+                        (self.vol_sz[2], self.vol_sz[1], self.vol_sz[0])).transpose(2, 1, 0)
+                    if prop_obj.no_data_marker is None:
+                        valid_arr = np.ones(data_arr.shape, dtype=bool)
+                    else:
+                        # Compare as 8 byte floats, as the marker is
+                        valid_arr = data_arr != np.float64(prop_obj.no_data_marker)
+                    has_values = bool(valid_arr.any())
+                    np.copyto(prop_obj.data_3d, data_arr, where=valid_arr)
+
+                    # Calculate minimum excluding 'no_data_marker' value
+                    if has_values:
+                        data_val = float(data_arr[valid_arr].min())
+                        if data_val < min_val:
+                            min_val = data_val
+
+                # If RGBA VOXET, loop over points in volume
+                else:
+                    x_terms, y_terms, z_terms = self.calc_vo_axis_terms(mult)
+                    o_x, o_y, o_z = self.axis_o
+                    for z_val in range(self.vol_sz[2]):
+                        z_term = z_terms[z_val]
+                        for y_val in range(self.vol_sz[1]):
+                            y_term = y_terms[y_val]
+                            for x_val in range(self.vol_sz[0]):
+                                x_term = x_terms[x_val]
+                                x_coord = o_x + (x_term[0] + y_term[0] + z_term[0])
+                                y_coord = o_y + (x_term[1] + y_term[1] + z_term[1])
+                                z_coord = o_z + (x_term[2] + y_term[2] + z_term[2])
                                 has_values = True
                                 data_val = fp_arr[fp_idx]
                                 prop_obj.assign_to_xyz((x_coord, y_coord, z_coord), data_val)
                                 prop_obj.assign_to_ijk((x_val, y_val, z_val), data_val)
 
-                            # Calculate minimum excluding 'no_data_marker' value
-                            if data_val < min_val and data_val != prop_obj.no_data_marker:
-                                min_val = data_val
+                                # Calculate minimum excluding 'no_data_marker' value
+                                if data_val < min_val and data_val != prop_obj.no_data_marker:
+                                    min_val = data_val
 
-                            fp_idx += 1
+                                fp_idx += 1
             # If SGRID
             elif self._is_sg:
                 # SGRID gets its coordinates from a points file
@@ -104,8 +131,15 @@ def read_volume_binary_files(self):
 
                 points_offset = pt_arr_sz + self.points_offset // 12 # 3 * 4-byte floats
                 dt = np.dtype([('x', '>f4'), ('y', '>f4'), ('z', '>f4')])
-                pt_arr = np.fromfile(self.points_file, dtype=dt, count=points_offset)
-                self.logger.debug(f"pt_arr = {pt_arr}")
+                # Memory map the points file, as with the property files
+                try:
+                    pt_arr = np.memmap(self.points_file, dtype=dt, mode='r',
+                                       shape=(points_offset,))
+                except ValueError:
+                    self.logger.error("Cannot process SGRID file, points file is too short")
+                    return False
+                if self._dbg:
+                    self.logger.debug(f"pt_arr = {pt_arr}")
                 self.logger.debug(f"pt_arr.shape = {pt_arr.shape}")
                 try:
                     pt_arr = pt_arr.reshape(self.vol_sz[0] + 1, self.vol_sz[1] + 1, self.vol_sz[2] + 1)
@@ -115,20 +149,29 @@ def read_volume_binary_files(self):
 
                 self.logger.debug(f"pt_arr.shape = {pt_arr.shape}")
 
+                self.calc_sg_extent(pt_arr)
+
+                # Calculate minimum excluding 'no_data_marker' value
+                data_arr = fp_arr[fp_idx:]
+                if prop_obj.no_data_marker is not None:
+                    data_arr = data_arr[data_arr != prop_obj.no_data_marker]
+                if data_arr.size > 0:
+                    data_val = data_arr.min()
+                    if data_val < min_val:
+                        min_val = data_val
+
                 # Loop over points in 3d SGRID
                 for z_val in range(self.vol_sz[2]):
                     for y_val in range(self.vol_sz[1]):
                         for x_val in range(self.vol_sz[0]):
                             # Calculate x,y,z coords
-                            x_coord, y_coord, z_coord = self.calc_sg_xyz(x_val, y_val, z_val, pt_arr)
+                            x_coord, y_coord, z_coord = self.calc_sg_xyz(x_val, y_val, z_val,
+                                                                         pt_arr, False)
                             data_val = fp_arr[fp_idx]
                             prop_obj.assign_to_xyz((x_coord, y_coord, z_coord), data_val)
                             prop_obj.assign_to_ijk((x_val, y_val, z_val), data_val)
                             has_values = True
                             fp_idx += 1
-                            # Calculate minimum excluding 'no_data_marker' value
-                            if data_val < min_val and data_val != prop_obj.no_data_marker:
-                                min_val = data_val
 
                             # self.logger.debug(f"fp[{x_val}, {y_val}, {z_val}] = {data_val}")
                             # self.logger.debug(f"x,y,z=[{x_coord}, {y_coord}, {z_coord}]")
@@ -169,8 +212,49 @@ def read_volume_binary_files(self):
     return True
 
 
-def calc_vo_xyz(self, x_idx, y_idx, z_idx, mult):
+def prefetch_volume_files(self):
+    ''' Ask the OS to start reading all the binary files of a volume in the background,
+        so that the disk reads of the property, points and flags files overlap,
+        rather than each file being fetched only when it is opened.
+        Only available where the OS supports 'posix_fadvise'
+    '''
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    file_list = [prop_obj.file_name for prop_obj in self.prop_dict.values()]
+    if self._is_sg:
+        file_list.append(self.points_file)
+    if not self.SKIP_FLAGS_FILE:
+        file_list.append(self.flags_file if self._is_vo else self.region_flags_file)
+    for file_name in file_list:
+        if not file_name:
+            continue
+        try:
+            fd = os.open(file_name, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError as exc:
+            self.logger.debug(f"Cannot prefetch {file_name}: {exc}")
+        finally:
+            os.close(fd)
+
+
+def calc_vo_extent(self, mult):
+    ''' Calculates the maxs & mins of the XYZ coords of a VOXET.
+        Coordinates are an affine function of the voxel indexes, so their extent is reached
+        at the 8 corners of the volume, there is no need to visit every voxel
+    '''
+    for z_val in {0, self.vol_sz[2] - 1}:
+        for y_val in {0, self.vol_sz[1] - 1}:
+            for x_val in {0, self.vol_sz[0] - 1}:
+                self.calc_vo_xyz(x_val, y_val, z_val, mult)
+
+
+def calc_vo_xyz(self, x_idx, y_idx, z_idx, mult, do_minmax=True):
     ''' Calculate the XYZ coords and their maxs & mins
+
+    :param do_minmax: calculate max & min of the XYZ coords
     ''' 
     x_coord = self.axis_o[0] + \
       (float(x_idx) * self.axis_u[0] * mult[0] + \
@@ -184,15 +268,49 @@ def calc_vo_xyz(self, x_idx, y_idx, z_idx, mult):
       (float(x_idx) * self.axis_w[0]* mult[0] + \
       float(y_idx) * self.axis_w[1] * mult[1] + \
       float(z_idx) * self.axis_w[2] * mult[2])
-    self.geom_obj.calc_minmax(x_coord, y_coord, z_coord)
+    if do_minmax:
+        self.geom_obj.calc_minmax(x_coord, y_coord, z_coord)
     return x_coord, y_coord, z_coord
 
 
-def calc_sg_xyz(self, x_idx, y_idx, z_idx, fp_arr):
+def calc_vo_axis_terms(self, mult):
+    ''' Calculates the contribution of each voxel index along each axis to the XYZ coords,
+        so that 'calc_vo_xyz' need not be called for every voxel
+
+    :param mult: size of a voxel along each axis, as a fraction of the axis vectors
+    :returns: a list of (x, y, z) tuples for each of the three axes, indexed by voxel index
+    '''
+    terms_list = []
+    for axis_idx in range(3):
+        terms_list.append([(float(idx) * self.axis_u[axis_idx] * mult[axis_idx],
+                            float(idx) * self.axis_v[axis_idx] * mult[axis_idx],
+                            float(idx) * self.axis_w[axis_idx] * mult[axis_idx])
+                           for idx in range(self.vol_sz[axis_idx])])
+    return terms_list
+
+
+def calc_sg_extent(self, fp_arr):
+    ''' Calculates the maxs & mins of the XYZ coords of the SGRID points that are used,
+        all at once rather than point by point
+
+    :param fp_arr: SGRID points array
+    ''' 
+    used_arr = fp_arr[:self.vol_sz[0], :self.vol_sz[1], :self.vol_sz[2]]
+    if used_arr.size == 0:
+        return
+    # NaN coordinates are ignored, as they are when comparing point by point
+    self.geom_obj.calc_minmax(*(np.nanmin(used_arr[axis]) for axis in ('x', 'y', 'z')))
+    self.geom_obj.calc_minmax(*(np.nanmax(used_arr[axis]) for axis in ('x', 'y', 'z')))
+
+
+def calc_sg_xyz(self, x_idx, y_idx, z_idx, fp_arr, do_minmax=True):
     ''' SGRID has coordinates in points file
+
+    :param do_minmax: calculate max & min of the XYZ coords
     ''' 
     x_coord, y_coord, z_coord = fp_arr[x_idx][y_idx][z_idx]
-    self.geom_obj.calc_minmax(x_coord, y_coord, z_coord)
+    if do_minmax:
+        self.geom_obj.calc_minmax(x_coord, y_coord, z_coord)
     return x_coord, y_coord, z_coord
 
 
@@ -225,42 +343,30 @@ def read_region_flags_file(self, flags_array_len, flags_file,
                               "length ({file_sz}) is less than calculated size ({est_sz})")
             sys.exit(1)
 
-        # Initialise data array to zeros
-        np.zeros((self.vol_sz[0], self.vol_sz[1], self.vol_sz[2]))
-
-        # Prepare 'numpy' dtype object for binary float, integer signed/unsigned data types
-        d_typ = np.dtype(('B', (flags_bit_sz)))
-
-        # Read entire file, assumes file small enough to store in memory
+        # Memory map the flags, one row of 'flags_bit_sz' bytes per voxel
         self.logger.info(f"Reading binary flags file: {flags_file}")
-        f_arr = np.fromfile(flags_file, dtype=d_typ)
         f_idx = flags_offset//flags_bit_sz
+        f_arr = np.memmap(flags_file, dtype=np.uint8, mode='r', offset=f_idx * flags_bit_sz,
+                          shape=(num_voxels, flags_bit_sz))
         self.flags_prop = PROPS(flags_file, self.logger.getEffectiveLevel())
-        # self.debug(f"self.region_dict.keys() = {self.region_dict.keys()}")
-        for z_val in range(0, self.vol_sz[2]):
-            for y_val in range(0, self.vol_sz[1]):
-                for x_val in range(0, self.vol_sz[0]):
-                    # self.logger.debug(f"{x}, {y}, {z} => {f_idx}, {f_arr[f_idx]}")
-                    # convert floating point number to a bit mask
-                    bit_mask = ''
-                    # NB: Single bytes are not returned as arrays
-                    if flags_bit_sz == 1:
-                        bit_mask = '{0:08b}'.format(f_arr[f_idx])
-                    else:
-                        for bit in range(flags_bit_sz - 1, -1, -1):
-                            bit_mask += '{0:08b}'.format(f_arr[f_idx][bit])
-                    # self.logger.debug(f"bit_mask= {bit_mask}")
-                    # self.logger.debug(f"self.region_dict = {self.region_dict}")
-                    cnt = flags_bit_sz * 8 - 1
-                    # Examine the bit mask one bit at a time, starting at the highest bit
-                    for bit in bit_mask:
-                        if str(cnt) in self.region_dict and bit == '1':
-                            key = self.region_dict[str(cnt)]
-                            # self.logger.debug(f"cnt = {cnt} bit = {bit}")
-                            # self.logger.debug(f"key = {key}")
-                            self.flags_prop.append_to_ijk((x_val, y_val, z_val), key)
-                        cnt -= 1
-                    f_idx += 1
+
+        # Bytes are stored lowest byte first, reverse them so that when unpacked,
+        # bit number 'cnt' is in column 'flags_bit_sz * 8 - 1 - cnt'
+        num_bits = flags_bit_sz * 8
+        bit_cols = [num_bits - 1 - cnt for cnt in range(num_bits - 1, -1, -1)
+                    if str(cnt) in self.region_dict]
+        if not bit_cols:
+            return True
+        bit_arr = np.unpackbits(f_arr[:, ::-1], axis=1)[:, bit_cols]
+
+        # Visit the set bits in voxel order, then highest bit first
+        vox_idx_arr, col_idx_arr = np.nonzero(bit_arr)
+        z_arr, y_arr, x_arr = np.unravel_index(vox_idx_arr, (self.vol_sz[2], self.vol_sz[1],
+                                                             self.vol_sz[0]))
+        key_list = [self.region_dict[str(num_bits - 1 - col)] for col in bit_cols]
+        for x_val, y_val, z_val, col_idx in zip(x_arr.tolist(), y_arr.tolist(), z_arr.tolist(),
+                                                col_idx_arr.tolist()):
+            self.flags_prop.append_to_ijk((x_val, y_val, z_val), key_list[col_idx])
 
     except OSError as exc:
         self.logger.error(f"SORRY - Cannot process voxel flags file, OSError " \
@@ -12,6 +12,18 @@ coverage run test_assimp_kit.py
 [ $? -ne 0 ] && exit 1
 popd > /dev/null
 
+pushd unit/conv_webasset > /dev/null
+coverage erase
+coverage run test_conv_webasset.py
+[ $? -ne 0 ] && exit 1
+popd > /dev/null
+
+pushd unit/db > /dev/null
+coverage erase
+coverage run test_query_db.py
+[ $? -ne 0 ] && exit 1
+popd > /dev/null
+
 # Avoid running in gitlab
 hostname -f | egrep '\.au$' > /dev/null 2>&1
 if [ $? -eq 0 ]; then
@@ -32,6 +44,6 @@ coverage erase
 coverage run db_tables.py
 popd > /dev/null
 
-coverage combine unit/gocad_import/.coverage unit/assimp_kit/.coverage unit/webapi/.coverage ../scripts/.coverage ../scripts/lib/db/.coverage
+coverage combine unit/gocad_import/.coverage unit/assimp_kit/.coverage unit/conv_webasset/.coverage unit/db/.coverage unit/webapi/.coverage ../scripts/.coverage ../scripts/lib/db/.coverage
 coverage report --omit '*/geomodel-2-3dweb/scripts/lib/exports/print_assimp.py'
 
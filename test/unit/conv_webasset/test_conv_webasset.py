@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Unit test for the COLLADA to GLTF conversion and parallel conversion in 'conv_webasset.py'
+
+Run this in local directory
+"""
+import sys
+import os
+import time
+import tempfile
+
+# Add in path to local library files
+sys.path.append(os.path.join('..', '..', '..', 'scripts'))
+
+import conv_webasset
+from lib.config_builder import ConfigBuilder
+
+
+class FakeConverter:
+    ''' Stands in for a converter, writes COLLADA files named after the source file.
+        Each file is written slowly, longer names more slowly, it only contains 'done'
+        once it is complete
+    '''
+    def __init__(self):
+        self.config_build_obj = ConfigBuilder()
+
+    def get_supported_exts(self):
+        return ['TS']
+
+    def process(self, filename_str, dest_dir):
+        base_name = os.path.splitext(os.path.basename(filename_str))[0]
+        for suffix in ['', '_0', '_1']:
+            with open(os.path.join(dest_dir, base_name + suffix + '.dae'), 'w') as file_p:
+                file_p.flush()
+                time.sleep(0.05 * len(base_name))
+                file_p.write('done')
+
+
+class SlowConverter:
+    ''' Stands in for a converter, logs when it starts and finishes writing a file's output,
+        so that files writing the same output at the same time can be found
+    '''
+    def __init__(self):
+        self.config_build_obj = ConfigBuilder()
+
+    def get_supported_exts(self):
+        return ['TS', 'PL']
+
+    def process(self, filename_str, dest_dir):
+        base_name = os.path.splitext(os.path.basename(filename_str))[0]
+        log_file = os.path.join(dest_dir, base_name + '.log')
+        with open(log_file, 'a') as file_p:
+            file_p.write('start\n')
+        time.sleep(0.2)
+        with open(log_file, 'a') as file_p:
+            file_p.write('end\n')
+
+
+def run_find_and_process(convert_collada, num_processes=1):
+    ''' Processes a directory of source files with 'find_and_process'
+
+    :param convert_collada: value of 'conv_webasset.CONVERT_COLLADA' during the run
+    :param num_processes: optional number of processes used to convert the source files
+    :returns: sorted list of (basename, contents) of the COLLADA files passed to the converter, \
+              contents are read when the file is passed
+    '''
+    converted_list = []
+
+    def record_file(daefile_str):
+        with open(daefile_str) as file_p:
+            converted_list.append((os.path.basename(daefile_str), file_p.read()))
+
+    conv_webasset.convert_one_file = record_file
+    conv_webasset.CONVERT_COLLADA = convert_collada
+    conv_webasset.NUM_PROCESSES = num_processes
+    with tempfile.TemporaryDirectory() as src_dir, tempfile.TemporaryDirectory() as dest_dir:
+        # 'a_2.ts' makes files which start with the same name as the files made by 'a.ts'
+        for file_name in ['a.ts', 'a_2.ts', 'b.ts']:
+            with open(os.path.join(src_dir, file_name), 'w'):
+                pass
+        # A COLLADA file which is not named after a source file
+        with open(os.path.join(dest_dir, 'other.dae'), 'w') as file_p:
+            file_p.write('done')
+        with conv_webasset.make_process_pool(FakeConverter, ()) as executor:
+            conv_webasset.find_and_process(FakeConverter(), src_dir, dest_dir, executor)
+    return sorted(converted_list)
+
+
+if __name__ == "__main__":
+    MSG = "\nTest conv_webasset conversion:"
+
+    # COLLADA conversion is on by default
+    if not conv_webasset.CONVERT_COLLADA:
+        print(MSG, "FAIL!! CONVERT_COLLADA is not on by default")
+        sys.exit(1)
+
+    # Every COLLADA file is converted exactly once, after it has been completely written
+    expected_list = [(base_name + '.dae', 'done') for base_name in
+                     ['a', 'a_0', 'a_1', 'a_2', 'a_2_0', 'a_2_1', 'b', 'b_0', 'b_1', 'other']]
+    for num_processes in [1, 3]:
+        converted_list = run_find_and_process(True, num_processes)
+        if converted_list != expected_list:
+            print(MSG, "FAIL!! using", num_processes, "processes, converted", converted_list,
+                  "expected", expected_list)
+            sys.exit(1)
+
+    # Nothing is converted when it is turned off, as with the '-g' flag
+    converted_list = run_find_and_process(False)
+    if converted_list:
+        print(MSG, "FAIL!! converted", converted_list, "when turned off")
+        sys.exit(1)
+
+    # Files with the same output files are not converted at the same time
+    conv_webasset.CONVERT_COLLADA = False
+    conv_webasset.NUM_PROCESSES = 3
+    with tempfile.TemporaryDirectory() as src_dir, tempfile.TemporaryDirectory() as dest_dir:
+        for file_name in ['x.ts', 'x.pl', 'y.ts']:
+            with open(os.path.join(src_dir, file_name), 'w'):
+                pass
+        with conv_webasset.make_process_pool(SlowConverter, ()) as executor:
+            conv_webasset.find_and_process(SlowConverter(), src_dir, dest_dir, executor)
+        with open(os.path.join(dest_dir, 'x.log')) as file_p:
+            x_log = file_p.read().split()
+    if x_log != ['start', 'end', 'start', 'end']:
+        print(MSG, "FAIL!! files with the same outputs overlapped:", x_log)
+        sys.exit(1)
+
+    print(MSG, "PASS")
+    sys.exit(0)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Unit test for merging query databases with 'QueryDB.merge()', as done in batch mode
+
+Run this in local directory
+"""
+import sys
+import os
+import tempfile
+
+# Add in path to local library files
+sys.path.append(os.path.join('..', '..', '..', 'scripts'))
+
+from lib.db.db_tables import QueryDB, Query, SegmentInfo, PartInfo, ModelInfo, UserInfo
+
+PART_ROWS_LIST = [
+    [('bh1_0', 'model_a', 'seg1', 'part1', 'model', None),
+     ('bh1_1', 'model_a', 'seg2', 'part1', 'model', None),
+     ('bh2_0', 'model_a', 'seg1', 'part2', None, 'user')],
+    # Overlaps the first part on ('bh1_1', 'model_a') and ('bh2_0', 'model_a')
+    [('bh1_1', 'model_a', 'seg3', 'part3', 'model', None),
+     ('bh2_0', 'model_a', 'seg1', 'part2', 'model', 'user'),
+     ('bh1_1', 'model_b', 'seg2', 'part1', None, None)]
+]
+''' Rows to be inserted into each part database, (label, model_name, segment, part, model, user)
+'''
+
+
+def insert_rows(qdb, row_list):
+    ''' Inserts rows into a query database in one transaction
+
+    :param qdb: 'QueryDB' object
+    :param row_list: list of rows, see 'PART_ROWS_LIST'
+    '''
+    for label, model_name, *json_list in row_list:
+        info_list = []
+        for json_str, add_func in zip(json_list, (qdb.add_segment, qdb.add_part,
+                                                  qdb.add_model, qdb.add_user)):
+            if json_str is None:
+                info_list.append(None)
+                continue
+            is_ok, info_obj = add_func(json_str, commit=False)
+            assert is_ok, info_obj
+            info_list.append(info_obj)
+        is_ok, err_str = qdb.add_query(label, model_name, *info_list, commit=False)
+        assert is_ok, err_str
+    is_ok, err_str = qdb.commit()
+    assert is_ok, err_str
+
+
+def dump_db(qdb):
+    ''' Reads the contents of a query database
+
+    :param qdb: 'QueryDB' object
+    :returns: (sorted list of query tuples, list of sorted JSON strings of each info table)
+    '''
+    query_list = sorted(qdb.query(query_obj.label, query_obj.model_name)[1]
+                        for query_obj in qdb.ses.query(Query))
+    info_list = [sorted(info_obj.json for info_obj in qdb.ses.query(info_class))
+                 for info_class in (SegmentInfo, PartInfo, ModelInfo, UserInfo)]
+    return query_list, info_list
+
+
+if __name__ == "__main__":
+    MSG = "\nTest QueryDB merge:"
+    with tempfile.TemporaryDirectory() as db_dir:
+        # Insert all the rows into one database, in order
+        seq_qdb = QueryDB(create=True, db_name=os.path.join(db_dir, 'seq.db'), writer=True)
+        for row_list in PART_ROWS_LIST:
+            insert_rows(seq_qdb, row_list)
+        seq_dump = dump_db(seq_qdb)
+        seq_qdb.close()
+
+        # Insert each part's rows into its own database, then merge them in order
+        part_name_list = []
+        for idx, row_list in enumerate(PART_ROWS_LIST):
+            part_name = os.path.join(db_dir, f"merged.db.part{idx}")
+            part_qdb = QueryDB(create=True, db_name=part_name, writer=True)
+            insert_rows(part_qdb, row_list)
+            part_qdb.close()
+            part_name_list.append(part_name)
+        merged_qdb = QueryDB(create=True, db_name=os.path.join(db_dir, 'merged.db'), writer=True)
+        for part_name in part_name_list:
+            is_ok, err_str = merged_qdb.merge(part_name)
+            if not is_ok:
+                print(MSG, "FAIL!! cannot merge", part_name, err_str)
+                sys.exit(1)
+            # The part database is closed after merging, so it can be removed
+            os.remove(part_name)
+        merged_dump = dump_db(merged_qdb)
+        merged_qdb.close()
+
+        # A merge that fails partway through leaves nothing behind to be committed later
+        part_name = os.path.join(db_dir, 'failed.db.part0')
+        part_qdb = QueryDB(create=True, db_name=part_name, writer=True)
+        insert_rows(part_qdb, PART_ROWS_LIST[0])
+        part_qdb.close()
+        failed_qdb = QueryDB(create=True, db_name=os.path.join(db_dir, 'failed.db'), writer=True)
+        add_query_list = []
+
+        def fail_second_query(*args, **kwargs):
+            add_query_list.append(args)
+            if len(add_query_list) == 2:
+                return False, 'second query failed'
+            return QueryDB.add_query(failed_qdb, *args, **kwargs)
+
+        failed_qdb.add_query = fail_second_query
+        is_ok, err_str = failed_qdb.merge(part_name)
+        failed_qdb.commit()
+        failed_dump = dump_db(failed_qdb)
+        failed_qdb.close()
+
+    if merged_dump != seq_dump:
+        print(seq_dump)
+        print('-------------------------------------------------------------------------------------------------')
+        print(merged_dump)
+        print(MSG, "FAIL!!")
+        sys.exit(1)
+
+    # Later parts overwrite earlier ones
+    if ('bh1_1', 'model_a', 'seg3', 'part3', 'model', None) not in merged_dump[0]:
+        print(merged_dump)
+        print(MSG, "FAIL!! later part did not overwrite earlier part")
+        sys.exit(1)
+
+    if is_ok or failed_dump != ([], [[], [], [], []]):
+        print(failed_dump)
+        print(MSG, "FAIL!! failed merge was partly committed")
+        sys.exit(1)
+
+    print(MSG, "PASS")
+    sys.exit(0)
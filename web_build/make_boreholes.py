@@ -13,13 +13,19 @@ import json
 from json import JSONDecodeError
 import logging
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool
+from functools import partial
+
+import numpy
 
 
 
 from lib.exports.bh_utils import make_borehole_filename, make_borehole_label
 from lib.exports.bh_make import get_blob_boreholes, get_nvcl_data
 from lib.exports.assimp_kit import AssimpKit
-from lib.exports.geometry_gen import colour_borehole_gen
+from lib.exports.geometry_gen import batch_borehole_gen
 from lib.db.db_tables import QueryDB, QUERY_DB_FILE
 from lib.file_processing import get_input_conv_param_bh
 from lib.coords import convert_coords
@@ -50,7 +56,31 @@ if not LOGGER.hasHandlers():
     LOGGER.addHandler(HANDLER)
 
 # We are exporting using AssimpKit, could also use ColladaKit
-EXPORT_KIT = AssimpKit(LOG_LVL)
+# 'AssimpKit' holds the scene being written, so each writer thread has its own
+THREAD_DATA = threading.local()
+''' Thread local storage for each thread's 'AssimpKit' object
+'''
+
+BH_INFO_KEYS = tuple(key for key in GSMLP_IDS
+                     if key not in ('name', 'identifier', 'metadata_uri'))
+''' Keys of borehole information copied into the popup box info dictionary
+'''
+
+BH_NVCL_KEYS = ('name', 'x', 'y', 'z', 'nvcl_id')
+''' Keys a borehole information dictionary must have to fetch its NVCL data
+'''
+
+NVCL_FETCH_WORKERS = 8
+''' Maximum number of boreholes whose NVCL data is fetched concurrently
+'''
+
+GLTF_WRITE_WORKERS = 4
+''' Number of threads writing GLTF files, in each process
+'''
+
+POOL_SZ = 3
+''' Number of input files processed in parallel in batch mode
+'''
 
 
 
@@ -65,8 +95,8 @@ def get_bh_info_dict(borehole_dict, param_obj):
     '''
     info_obj = {}
     info_obj['title'] = borehole_dict['name']
-    for key in GSMLP_IDS:
-        if key not in ['name', 'identifier', 'metadata_uri'] and borehole_dict[key]:
+    for key in BH_INFO_KEYS:
+        if borehole_dict[key]:
             info_obj[key] = borehole_dict[key]
     info_obj['href'] = [{'label': 'WFS URL', 'URL': borehole_dict['href']}]
     if hasattr(param_obj, 'EXTERNAL_LINK'):
@@ -76,18 +106,16 @@ def get_bh_info_dict(borehole_dict, param_obj):
     return info_obj
 
 
-def get_loadconfig_dict(borehole_dict, param_obj):
+def get_loadconfig_dict(borehole_dict, x_m, y_m):
     ''' Creates a config dictionary, used to load a static GLTF file
 
     :param borehole_dict: dictionary of borehole data
-    :param param_obj: object containing command line parameters
+    :param x_m, y_m: borehole's x,y coordinates converted to the model's CRS
     :return: config dictionary
     '''
     j_dict = {}
     j_dict['type'] = 'GLTFObject'
-    x_m, y_m = convert_coords(param_obj.BOREHOLE_CRS, param_obj.MODEL_CRS,
-                              [borehole_dict['x'], borehole_dict['y']])
-    j_dict['position'] = [x_m, y_m, borehole_dict['z']]
+    j_dict['position'] = [float(x_m), float(y_m), borehole_dict['z']]
     j_dict['model_url'] = make_borehole_filename(borehole_dict['name'])+".gltf"
     j_dict['display_name'] = borehole_dict['name']
     j_dict['include'] = True
@@ -95,6 +123,41 @@ def get_loadconfig_dict(borehole_dict, param_obj):
     return j_dict
 
 
+def fetch_nvcl_data(reader, height_res, borehole_dict, x_m, y_m):
+    ''' Fetches a borehole's NVCL data from the NVCL services, can be run in a thread pool
+
+    :param reader: NVCLReader object
+    :param height_res: borehole data height resolution (float, metres)
+    :param borehole_dict: borehole information dictionary
+    :param x_m,y_m: x,y coordinates of borehole collar, already converted to model CRS
+    :returns: (NVCL data dictionary, base_xyz) tuple from 'get_nvcl_data()' \
+              or None if borehole has no coordinates or NVCL id
+    '''
+    if all(key in borehole_dict for key in BH_NVCL_KEYS):
+        return get_nvcl_data(reader, height_res, x_m, y_m, borehole_dict['z'],
+                             borehole_dict['nvcl_id'])
+    return None
+
+
+def write_borehole_gltf(base_xyz, borehole_name, bh_data_dict, height_res, out_filename,
+                        mesh_list):
+    ''' Writes a borehole GLTF file using the calling thread's 'AssimpKit' object, \
+        can be run in a thread pool
+
+    :param base_xyz: base vertex, position of the borehole within the model [x,y,z]
+    :param borehole_name: name of borehole
+    :param bh_data_dict: NVCL data dictionary from 'get_nvcl_data()'
+    :param height_res: borehole data height resolution (float, metres)
+    :param out_filename: destination directory+file (without extension)
+    :param mesh_list: list of the tuples yielded by 'batch_borehole_gen()' for this borehole
+    :returns: the value returned by 'AssimpKit.write_borehole()'
+    '''
+    if not hasattr(THREAD_DATA, 'export_kit'):
+        THREAD_DATA.export_kit = AssimpKit(LOG_LVL)
+    return THREAD_DATA.export_kit.write_borehole(base_xyz, borehole_name, bh_data_dict,
+                                                 height_res, out_filename, mesh_list)
+
+
 def get_boreholes(reader, qdb, param_obj, output_mode='GLTF', dest_dir=''):
     ''' Retrieves borehole data and writes 3D model files to a directory or a blob \
         If 'dest_dir' is supplied, then files are written \
@@ -108,7 +171,7 @@ def get_boreholes(reader, qdb, param_obj, output_mode='GLTF', dest_dir=''):
     :param dest_dir: optional directory where 3D model files are written
     :returns: config object list and optional GLTF blob object
     '''
-    LOGGER.debug("get_boreholes(%s, %s, %s)", str(param_obj), output_mode, dest_dir)
+    LOGGER.debug("get_boreholes(%s, %s, %s)", param_obj, output_mode, dest_dir)
 
     # Get all NVCL scanned boreholes within BBOX
     borehole_list = reader.get_boreholes_list()
@@ -118,74 +181,106 @@ def get_boreholes(reader, qdb, param_obj, output_mode='GLTF', dest_dir=''):
         return [], None
 
     height_res = 10.0
-    LOGGER.debug("borehole_list = %s", str(borehole_list))
+    LOGGER.debug("borehole_list = %s", borehole_list)
     blob_obj = None
     # Parse response for all boreholes, make COLLADA files
     bh_cnt = 0
     loadconfig_list = []
-    for borehole_dict in borehole_list:
 
-        # Get borehole information dictionary, and add to query db
-        bh_info_dict = get_bh_info_dict(borehole_dict, param_obj)
-        is_ok, p_obj = qdb.add_part(json.dumps(bh_info_dict))
-        if not is_ok:
-            LOGGER.warning("Cannot add part to db: %s", p_obj)
-            continue
+    # Convert all the boreholes' x,y coordinates to the model's CRS in one call
+    x_m_arr, y_m_arr = convert_coords(param_obj.BOREHOLE_CRS, param_obj.MODEL_CRS,
+                                      [numpy.array([bh.get('x', numpy.nan) for bh in borehole_list],
+                                                   dtype=numpy.float64),
+                                       numpy.array([bh.get('y', numpy.nan) for bh in borehole_list],
+                                                   dtype=numpy.float64)])
 
-        if all(key in borehole_dict for key in ['name', 'x', 'y', 'z', 'nvcl_id']):
-            bh_data_dict, base_xyz = get_nvcl_data(reader, param_obj, height_res, borehole_dict['x'], borehole_dict['y'], borehole_dict['z'], borehole_dict['nvcl_id'])
-            if bh_data_dict == {}:
-                LOGGER.warning('NVCL data not available for %s', borehole_dict['nvcl_id'])
+    # Network latency dominates, so fetch NVCL data for several boreholes at once
+    with ThreadPoolExecutor(max_workers=NVCL_FETCH_WORKERS) as executor:
+        nvcl_data_list = list(executor.map(partial(fetch_nvcl_data, reader, height_res),
+                                           borehole_list, x_m_arr, y_m_arr))
+
+    # COLLADA is only needed if not writing GLTF directly
+    if output_mode != 'GLTF':
+        # pylint: disable=C0415
+        from lib.exports import collada2gltf
+        from lib.exports.collada_kit import ColladaKit
+        collada_kit = ColladaKit(LOG_LVL)
+
+    # GLTF files are written in parallel, db inserts stay in this thread
+    with ThreadPoolExecutor(max_workers=GLTF_WRITE_WORKERS) as write_executor:
+        write_future_list = []
+        for borehole_dict, nvcl_data, x_m, y_m in zip(borehole_list, nvcl_data_list,
+                                                      x_m_arr, y_m_arr):
+
+            # Get borehole information dictionary, and add to query db
+            bh_info_dict = get_bh_info_dict(borehole_dict, param_obj)
+            is_ok, p_obj = qdb.add_part(json.dumps(bh_info_dict), commit=False)
+            if not is_ok:
+                LOGGER.warning("Cannot add part to db: %s", p_obj)
                 continue
-            # If there's NVCL data, then create the borehole
-            first_depth = -1
-            # pylint: disable=W0612
-            for vert_list, indices, colour_idx, depth, rgba_colour, class_dict, mesh_name in \
-                colour_borehole_gen(base_xyz, borehole_dict['name'], bh_data_dict, height_res):
-                if first_depth < 0:
-                    first_depth = int(depth)
-                is_ok, s_obj = qdb.add_segment(json.dumps(class_dict))
-                if not is_ok:
-                    LOGGER.warning("Cannot add segment to db: %s", s_obj)
+
+            if nvcl_data is not None:
+                bh_data_dict, base_xyz = nvcl_data
+                if bh_data_dict == {}:
+                    LOGGER.warning('NVCL data not available for %s', borehole_dict['nvcl_id'])
                     continue
+                # If there's NVCL data, then create the borehole
+                # One db segment for each mesh, i.e. for each colour, as in the GLTF file
+                # The meshes are made once, and used for both the db and the GLTF file
+                mesh_list = list(batch_borehole_gen(base_xyz, borehole_dict['name'], bh_data_dict,
+                                                    height_res))
                 # Using 'make_borehole_label()' ensures that name is the same
-                # in both db and GLTF file
-                bh_label = make_borehole_label(borehole_dict['name'], first_depth)
-                bh_str = "{0}_{1}".format(bh_label.decode('utf-8'), colour_idx)
-                is_ok, r_obj = qdb.add_query(bh_str, param_obj.modelUrlPath,
-                                             s_obj, p_obj, None, None)
-                if not is_ok:
-                    LOGGER.warning("Cannot add query to db: %s", r_obj)
-                    continue
-                LOGGER.debug("ADD_QUERY(%s, %s)", mesh_name, param_obj.modelUrlPath)
-
-            file_name = make_borehole_filename(borehole_dict['name'])
-            if output_mode == 'GLTF':
-                blob_obj = EXPORT_KIT.write_borehole(base_xyz, borehole_dict['name'],
-                                                     bh_data_dict, height_res,
-                                                     os.path.join(dest_dir, file_name))
-
-            elif dest_dir != '':
-                import exports.collada2gltf
-                from exports.collada_kit import ColladaKit
-                export_kit = ColladaKit(LOG_LVL)
-                export_kit.write_borehole(base_xyz, borehole_dict['name'], bh_data_dict,
-                                          height_res, os.path.join(dest_dir, file_name))
-                blob_obj = None
-            else:
-                LOGGER.warning("ColladaKit cannot write blobs")
-                sys.exit(1)
-            loadconfig_list.append(get_loadconfig_dict(borehole_dict, param_obj))
-            bh_cnt += 1
+                # in both db and GLTF file, it is labelled with the depth of the first mesh
+                first_depth = int(mesh_list[0][3])
+                bh_label = make_borehole_label(borehole_dict['name'], first_depth).decode('utf-8')
+                # pylint: disable=W0612
+                for vert_list, indices, colour_idx, depth, rgba_colour, class_dict, mesh_name in \
+                    mesh_list:
+                    is_ok, s_obj = qdb.add_segment(json.dumps(class_dict), commit=False)
+                    if not is_ok:
+                        LOGGER.warning("Cannot add segment to db: %s", s_obj)
+                        continue
+                    bh_str = "{0}_{1}".format(bh_label, colour_idx)
+                    is_ok, r_obj = qdb.add_query(bh_str, param_obj.modelUrlPath,
+                                                 s_obj, p_obj, None, None, commit=False)
+                    if not is_ok:
+                        LOGGER.warning("Cannot add query to db: %s", r_obj)
+                        continue
+                    LOGGER.debug("ADD_QUERY(%s, %s)", mesh_name, param_obj.modelUrlPath)
+
+                file_name = make_borehole_filename(borehole_dict['name'])
+                if output_mode == 'GLTF':
+                    write_future_list.append(
+                        write_executor.submit(write_borehole_gltf, base_xyz, borehole_dict['name'],
+                                              bh_data_dict, height_res,
+                                              os.path.join(dest_dir, file_name), mesh_list))
+
+                elif dest_dir != '':
+                    collada_kit.write_borehole(base_xyz, borehole_dict['name'], bh_data_dict,
+                                               height_res, os.path.join(dest_dir, file_name))
+                    blob_obj = None
+                else:
+                    LOGGER.warning("ColladaKit cannot write blobs")
+                    sys.exit(1)
+                loadconfig_list.append(get_loadconfig_dict(borehole_dict, x_m, y_m))
+                bh_cnt += 1
+
+        # Wait for GLTF files to be written, raising any errors from the writer threads
+        for write_future in write_future_list:
+            blob_obj = write_future.result()
+
+    # Write all the parts, segments and queries to db in one transaction
+    is_ok, err_str = qdb.commit()
+    if not is_ok:
+        LOGGER.warning("Cannot commit boreholes to db: %s", err_str)
 
     LOGGER.info("Found NVCL data for %d/%d boreholes", bh_cnt, len(borehole_list))
     if output_mode != 'GLTF':
         # Convert COLLADA files to GLTF
-        exports.collada2gltf.convert_dir(dest_dir, "Borehole*.dae")
+        collada2gltf.convert_dir(dest_dir, "Borehole*.dae")
         # Return borehole objects
 
-    LOGGER.debug("Returning: loadconfig_list, blobobj = %s, %s", str(loadconfig_list),
-                 str(blob_obj))
+    LOGGER.debug("Returning: loadconfig_list, blobobj = %s, %s", loadconfig_list, blob_obj)
     return loadconfig_list, blob_obj
 
 
@@ -205,21 +300,88 @@ def process_single(dest_dir, input_file, db_name, create_db=True):
     if reader.wfs is None:
         LOGGER.error("Cannot contact web service")
         return
-    qdb = QueryDB(create=create_db, db_name=db_name)
+    qdb = QueryDB(create=create_db, db_name=db_name, writer=True)
     err_str = qdb.get_error()
     if err_str != '':
         LOGGER.error("Cannot open/create database: %s", err_str)
         sys.exit(1)
-    # pylint: disable=W0612
-    borehole_loadconfig, none_obj = get_boreholes(reader, qdb, param_obj, output_mode='GLTF',
-                                                  dest_dir=dest_dir)
-    LOGGER.debug("borehole_loadconfig = %s", repr(borehole_loadconfig))
+    try:
+        # pylint: disable=W0612
+        borehole_loadconfig, none_obj = get_boreholes(reader, qdb, param_obj, output_mode='GLTF',
+                                                      dest_dir=dest_dir)
+    finally:
+        # Leaves the database as a single file, ready to be deployed
+        is_ok, err_str = qdb.close()
+        if not is_ok:
+            LOGGER.warning("Cannot close database: %s", err_str)
+    LOGGER.debug("borehole_loadconfig = %r", borehole_loadconfig)
     if borehole_loadconfig:
         LOGGER.info("Writing to: %s", out_filename)
         with open(out_filename, 'w') as file_p:
             json.dump(borehole_loadconfig, file_p, indent=4, sort_keys=True)
 
 
+def process_batch_file(dest_dir, input_file, db_name):
+    ''' Process a single model's boreholes in a batch worker process, \
+        each worker writes to its own database and its own directory
+
+    :param dest_dir: worker's directory to output files
+    :param input_file: conversion parameter file
+    :param db_name: name of worker's database
+    :returns: True if the worker's database can be merged
+    '''
+    try:
+        process_single(dest_dir, input_file, db_name)
+    except SystemExit:
+        LOGGER.error("Cannot process %s", input_file)
+        return False
+    return os.path.isfile(db_name)
+
+
+def process_batch(dest_dir, input_file_list, db_name):
+    ''' Process many models' boreholes in parallel, each model's database rows are written \
+        to a separate database, which are then merged in order into one database. \
+        Models can share boreholes, so each model's files are written to a separate \
+        directory, and then moved in order into 'dest_dir', later models overwriting earlier ones
+
+    :param dest_dir: directory to output database and files
+    :param input_file_list: list of conversion parameter files
+    :param db_name: name of database
+    '''
+    part_db_list = [f"{db_name}.part{idx}" for idx in range(len(input_file_list))]
+    part_dir_list = [os.path.join(dest_dir, f".part{idx}") for idx in range(len(input_file_list))]
+    for part_dir in part_dir_list:
+        os.makedirs(part_dir, exist_ok=True)
+    arg_list = [(part_dir, input_file, part_db) for part_dir, input_file, part_db
+                in zip(part_dir_list, input_file_list, part_db_list)]
+    with Pool(POOL_SZ) as pool:
+        ok_list = pool.starmap(process_batch_file, arg_list)
+
+    # GLTF files refer to their '.bin' files by name, so files keep their names when moved
+    for part_dir in part_dir_list:
+        for file_name in os.listdir(part_dir):
+            os.replace(os.path.join(part_dir, file_name), os.path.join(dest_dir, file_name))
+        os.rmdir(part_dir)
+
+    qdb = QueryDB(create=True, db_name=db_name, writer=True)
+    err_str = qdb.get_error()
+    if err_str != '':
+        LOGGER.error("Cannot open/create database: %s", err_str)
+        sys.exit(1)
+    for is_ok, part_db in zip(ok_list, part_db_list):
+        if is_ok:
+            is_ok, err_str = qdb.merge(part_db)
+            if not is_ok:
+                LOGGER.error("Cannot merge database %s: %s", part_db, err_str)
+        for file_name in (part_db, part_db + '-wal', part_db + '-shm'):
+            if os.path.isfile(file_name):
+                os.remove(file_name)
+    # Leaves the database as a single file, ready to be deployed
+    is_ok, err_str = qdb.close()
+    if not is_ok:
+        LOGGER.warning("Cannot close database: %s", err_str)
+
+
 if __name__ == "__main__":
     PARSER = argparse.ArgumentParser(description='Create borehole data: GLTF, JSON and database.')
     PARSER.add_argument('dest_dir', help='directory to hold output files',
@@ -261,14 +423,10 @@ if __name__ == "__main__":
         if not os.path.isfile(ARGS.batch):
             LOGGER.error("Batch file does not exist: %s", ARGS.batch)
             sys.exit(1)
-        CREATE_DB = True
         with open(ARGS.batch, 'r') as fp:
-            for line in fp:
-                # Skip lines starting with '#'
-                if line[0] != '#':
-                    process_single(ARGS.dest_dir, line.rstrip('\n'),
-                                   os.path.join(ARGS.dest_dir, ARGS.database), CREATE_DB)
-                    CREATE_DB = False
+            # Skip lines starting with '#'
+            INPUT_FILE_LIST = [line.rstrip('\n') for line in fp if line[0] != '#']
+        process_batch(ARGS.dest_dir, INPUT_FILE_LIST, os.path.join(ARGS.dest_dir, ARGS.database))
     else:
         print("No input file or batch file specified\n")
         PARSER.print_help()